@@ -1,136 +1,512 @@
+import cProfile
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import dash
+import flask
 from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 import plotly.express as px
 import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
-from database_utils import fetch_employee_performance_data # Import our data fetching utility
+from database_utils import ( # Import our data fetching utilities
+    fetch_employee_performance_data, fetch_employee_performance_data_chunked, fetch_employee_summary,
+    fetch_department_position_summary, fetch_employee_performance_history, fetch_source_fingerprint, fetch_dashboard_aggregates, compact_frame,
+    PERFORMANCE_DTYPES
+)
+from data_processing import (
+    preprocess_performance_data, preprocess_employee_summary, aggregate_performance, finalize_summary,
+    merge_performance_updates, replace_summary_rows, score_keys, score_histogram, tenure_years, SUMMARY_COLUMNS
+)
+from filter_index import SummaryFilterIndex
+from figure_cache import FigureCache, normalize_selection
+from trend_index import EmployeeTrendIndex
+from monthly_rollup import MonthlyRollup, month_label
+from employee_search import EmployeeSearchIndex
+from snapshot import read_snapshot, write_snapshot
+from shared_data import publish_shared_data, attach_shared_data
+from downsampling import lttb_indices
+from metrics import registry, time_stage
 
 # Initialize the Dash app
 app = dash.Dash(__name__)
 
+# How often the background refresher polls for new performance rows
+REFRESH_INTERVAL_SECONDS = 60
+# Load through the chunked, compact-dtype fetch (employee attributes kept once per employee in df_summary)
+COMPACT_LOAD = os.environ.get('EMPLOYEE_DASHBOARD_COMPACT_LOAD', '0') == '1'
+# Compute the dashboard figures with aggregate queries per request instead of from in-memory frames,
+# for performance tables larger than RAM (run migrate_schema.py first so the queries are indexed)
+PUSHDOWN_QUERIES = os.environ.get('EMPLOYEE_DASHBOARD_PUSHDOWN', '0') == '1'
+# Read the trigger-maintained employee_summary table instead of scanning performance, and the
+# overall and department bars from department_position_summary;
+# df_raw stays empty and trends are fetched per employee on demand. Pushdown mode
+# loads this way too: the summary only feeds the filter options and employee search
+PRECOMPUTED_SUMMARY = os.environ.get('EMPLOYEE_DASHBOARD_PRECOMPUTED_SUMMARY', '0') == '1' or PUSHDOWN_QUERIES
+# Directory of the columnar snapshot used for fast restarts; empty disables snapshots
+SNAPSHOT_DIR = os.environ.get('EMPLOYEE_DASHBOARD_SNAPSHOT_DIR', '')
+# Shared-memory mode for multi-worker servers: one loader process (python shared_data.py) loads from the
+# database and publishes memory-mapped versions into SHARED_DATA_DIR; worker processes attach read-only
+SHARED_DATA_DIR = os.environ.get('EMPLOYEE_DASHBOARD_SHARED_DIR', '')
+SHARED_DATA_ROLE = os.environ.get('EMPLOYEE_DASHBOARD_SHARED_ROLE', 'worker') if SHARED_DATA_DIR else ''
+# Number of filter selections whose rendered dashboard figures are kept
+FIGURE_CACHE_SIZE = 128
+# Directory receiving one cProfile dump per callback request; empty disables profiling
+PROFILE_DIR = os.environ.get('EMPLOYEE_DASHBOARD_PROFILE_DIR', '')
+# Date windows (month ranges) whose summary and filter index are kept
+WINDOW_INDEX_CACHE_SIZE = 16
+# Most employees offered by the trend picker for one search
+EMPLOYEE_SEARCH_LIMIT = 20
+# Threads building the six dashboard figures of a selection concurrently; 0 builds them one after another
+FIGURE_BUILD_WORKERS = int(os.environ.get('EMPLOYEE_DASHBOARD_FIGURE_WORKERS', '6'))
+# Bins of the attendance histogram, computed server-side
+ATTENDANCE_BINS = 10
+# Longest series drawn per trend line; longer ones are downsampled with LTTB (0 draws every point)
+TREND_MAX_POINTS = 1000
+
 # --- Data Loading and Preprocessing ---
-def get_processed_data():
-    df = fetch_employee_performance_data()
+def get_precomputed_data():
+    employee_summary = fetch_employee_summary()
+
+    if employee_summary.empty:
+        print("No summary rows fetched from the database. Dashboard might be empty.")
+        return pd.DataFrame(), pd.DataFrame()
+
+    return pd.DataFrame(), finalize_summary(preprocess_employee_summary(employee_summary))
+
+def get_precomputed_partials():
+    """Returns the department/position partials kept by the database, or None to group them from the summary."""
+    if not PRECOMPUTED_SUMMARY:
+        return None
+    partials = fetch_department_position_summary()
+    if partials.empty:
+        return None
+    return partials.set_index(['department', 'position'])
+
+def load_from_database():
+    if PRECOMPUTED_SUMMARY:
+        return get_precomputed_data()
+
+    employees = None
+    if COMPACT_LOAD:
+        employees, df = fetch_employee_performance_data_chunked()
+    else:
+        df = fetch_employee_performance_data()
 
     if df.empty:
         print("No data fetched from the database. Dashboard might be empty.")
-        return pd.DataFrame()
-
-    # Data type conversion
-    df['hire_date'] = pd.to_datetime(df['hire_date'])
-    df['performance_date'] = pd.to_datetime(df['performance_date'])
+        return pd.DataFrame(), pd.DataFrame()
 
-    # Calculate tenure (in years)
-    df['tenure'] = (pd.to_datetime('today') - df['hire_date']).dt.days / 365.25
+    with time_stage('dtype_conversion'):
+        df = preprocess_performance_data(df)
 
     # Group by employee to get latest performance metrics and overall averages
-    # For KPIs, appraisal, and attendance, we take the average across all records for an employee
     # For top/bottom performers, you might want to consider the latest record or an average over a recent period.
     # For simplicity, let's average all historical records for now.
-    employee_summary = df.groupby('employee_id').agg(
-        first_name=('first_name', 'first'),
-        last_name=('last_name', 'first'),
-        department=('department', 'first'),
-        position=('position', 'first'),
-        hire_date=('hire_date', 'first'),
-        salary=('salary', 'first'),
-        avg_kpi_score=('kpi_score', 'mean'),
-        avg_attendance_score=('attendance_score', 'mean'),
-        avg_appraisal_rating=('appraisal_rating', 'mean'),
-        latest_kpi_score=('kpi_score', lambda x: x.iloc[0] if not x.empty else None), # Get latest for single metric
-        latest_attendance_score=('attendance_score', lambda x: x.iloc[0] if not x.empty else None),
-        latest_appraisal_rating=('appraisal_rating', lambda x: x.iloc[0] if not x.empty else None),
-        num_performance_records=('performance_id', 'count')
-    ).reset_index()
-
-    employee_summary['full_name'] = employee_summary['first_name'] + ' ' + employee_summary['last_name']
-    employee_summary['tenure'] = (pd.to_datetime('today') - employee_summary['hire_date']).dt.days / 365.25
+    with time_stage('groupby'):
+        employee_summary = finalize_summary(aggregate_performance(df, employees))
 
     return df, employee_summary
 
-df_raw, df_summary = get_processed_data()
+def get_processed_data():
+    """Loads df_raw and df_summary, from the columnar snapshot when it matches the database.
+
+    With SNAPSHOT_DIR set, the database is only asked for row counts and max
+    ids; if they match the snapshot, its columns are memory-mapped instead of
+    re-running the full query and aggregation, otherwise the data is loaded
+    from the database and a fresh snapshot written.
+    """
+    start_time = time.perf_counter()
+    fingerprint = None
+    if SNAPSHOT_DIR:
+        set_warmup_stage('checking snapshot')
+        fingerprint = fetch_source_fingerprint()
+        if fingerprint is not None:
+            # Frames differ between load modes and summary layouts, so a snapshot is only valid for the code that wrote it
+            fingerprint.update(compact_load=COMPACT_LOAD, precomputed_summary=PRECOMPUTED_SUMMARY, summary_columns=SUMMARY_COLUMNS)
+            frames, bytes_read = read_snapshot(SNAPSHOT_DIR, fingerprint)
+            if frames is not None:
+                print(f"Loaded snapshot from {SNAPSHOT_DIR} in {time.perf_counter() - start_time:.2f}s ({bytes_read:,} bytes mapped).")
+                # The snapshot may be days old, and tenure counts up to today
+                for frame in (frames['raw'], frames['summary']):
+                    if 'tenure' in frame:
+                        frame['tenure'] = tenure_years(frame['hire_date'])
+                return frames['raw'], frames['summary']
+
+    set_warmup_stage('loading from database')
+    df, employee_summary = load_from_database()
+    bytes_read = int(df.memory_usage(deep=True).sum() + employee_summary.memory_usage(deep=True).sum())
+    print(f"Loaded data from the database in {time.perf_counter() - start_time:.2f}s ({bytes_read:,} bytes in memory).")
+
+    if fingerprint is not None and not employee_summary.empty:
+        set_warmup_stage('writing snapshot')
+        write_snapshot(SNAPSHOT_DIR, {'raw': df, 'summary': employee_summary}, fingerprint)
+    return df, employee_summary
 
-# Check if data is loaded
-if df_raw.empty or df_summary.empty:
-    print("Dashboard will show no data due to empty DataFrames.")
+# Data starts empty and is filled by the background warmup (see start_warmup below),
+# so importing the app and serving the first page never waits on the database
+df_raw, df_summary = pd.DataFrame(), pd.DataFrame()
+# Bumped on every data swap; part of the figure cache key
+data_version = 0
+summary_index = SummaryFilterIndex(df_summary, version=data_version)
+figure_cache = FigureCache(FIGURE_CACHE_SIZE)
+figure_executor = ThreadPoolExecutor(max_workers=FIGURE_BUILD_WORKERS, thread_name_prefix='figure-build') if FIGURE_BUILD_WORKERS > 0 else None
+# plotly finishes its imports lazily on the first figure, which is not thread-safe,
+# so the first set of figures is built serially under this lock
+figure_warmup_lock = threading.Lock()
+figures_warmed_up = False
+trend_index = EmployeeTrendIndex(df_raw)
+monthly_rollup = MonthlyRollup(df_raw, df_summary, version=data_version)
+employee_search = EmployeeSearchIndex(df_summary)
+window_index_cache = FigureCache(WINDOW_INDEX_CACHE_SIZE)
+# High-water mark for incremental refreshes: only rows above it are fetched next time
+last_performance_id = 0
+# Shared data version this worker is attached to
+attached_version = None
+_refresh_lock = threading.Lock()
+
+_dashboard_layout = None
+_layout_lock = threading.Lock()
+
+# Load progress reported by the /ready endpoint and the loading page
+warmup_status = {'state': 'starting', 'stage': 'starting', 'started_at': time.time(), 'finished_at': None, 'error': None}
+
+def set_warmup_stage(stage):
+    warmup_status['stage'] = stage
+
+def publish_data(new_raw, new_summary, new_trend_index=None, new_rollup_buckets=None, changed_employee_ids=None,
+                 partials=None, new_summary_index=None, new_search_index=None):
+    """Swaps in freshly loaded frames together with the structures derived from them.
+
+    new_trend_index, new_rollup_buckets, new_summary_index and new_search_index, when given,
+    were already derived from new_raw and new_summary (merged on refresh, or
+    attached from shared data).
+    changed_employee_ids, when given, are the only employees whose rows differ
+    from the current df_summary, so the summary index is patched for them.
+    partials, when given, are the summary index's department/position partials
+    as read from the database (see get_precomputed_partials).
+    """
+    global df_raw, df_summary, summary_index, data_version, trend_index, monthly_rollup, employee_search, _dashboard_layout
+    with time_stage('summary_index'):
+        if new_summary_index is not None:
+            # Attached from shared data, where it was built for this summary; stamp it with this process's version
+            new_index = new_summary_index
+            new_index.version = data_version + 1
+        elif changed_employee_ids is not None:
+            new_index = summary_index.updated(new_summary, changed_employee_ids, version=data_version + 1, partials=partials)
+        else:
+            new_index = SummaryFilterIndex(new_summary, version=data_version + 1, partials=partials)
+    if new_trend_index is None:
+        new_trend_index = trend_index if new_raw is df_raw else EmployeeTrendIndex(new_raw)
+    if new_rollup_buckets is not None:
+        new_rollup = MonthlyRollup.from_buckets(new_rollup_buckets, new_summary, version=new_index.version)
+    else:
+        with time_stage('monthly_rollup'):
+            new_rollup = MonthlyRollup(new_raw, new_summary, version=new_index.version)
+    with time_stage('employee_search_index'):
+        if new_search_index is not None:
+            new_search = new_search_index
+        # Score-only refreshes keep the same people; rebuild the index only when names or emails changed
+        elif employee_search.covers(new_summary, changed_employee_ids):
+            new_search = employee_search
+        else:
+            new_search = EmployeeSearchIndex(new_summary)
+    # Before the first publish the search index is the empty placeholder, never published
+    search_unchanged = new_search is employee_search and data_version > 0
+    df_raw, df_summary, summary_index, data_version, trend_index, monthly_rollup, employee_search = (
+        new_raw, new_summary, new_index, new_index.version, new_trend_index, new_rollup, new_search
+    )
+    # Entries for the old version can no longer be hit; drop them now rather than waiting for eviction
+    figure_cache.clear()
+    window_index_cache.clear()
+    # Dropdown options depend on the data; rebuild the layout on the next page load
+    _dashboard_layout = None
+
+    if SHARED_DATA_ROLE == 'loader':
+        version = publish_shared_data(SHARED_DATA_DIR, new_summary, new_trend_index, new_rollup.buckets, new_index, new_search,
+                                      search_unchanged=search_unchanged)
+        print(f"Published shared data version {version}.")
+
+def attach_shared_version():
+    """Attaches to the newest shared data version, if it differs from the current one."""
+    global attached_version
+    attached = attach_shared_data(SHARED_DATA_DIR)
+    if attached is None or attached[0] == attached_version:
+        return False
+    version, summary, shared_trend_index, rollup_buckets, shared_summary_index, shared_search_index = attached
+    # The date-ordered trend rows double as df_raw; nothing is copied out of the mapping
+    publish_data(shared_trend_index.ordered, summary, shared_trend_index, rollup_buckets,
+                 new_summary_index=shared_summary_index, new_search_index=shared_search_index)
+    attached_version = version
+    return True
+
+def refresh_data():
+    """Fetches performance rows newer than the high-water mark and merges them into the loaded data.
+
+    The new frames are built off to the side and swapped in with plain
+    assignments, so callbacks keep serving the previous data meanwhile.
+    Returns the number of new rows merged.
+    """
+    global last_performance_id
+
+    with _refresh_lock:
+        if SHARED_DATA_ROLE == 'worker':
+            # The loader process does the database work; just follow its versions
+            return int(attach_shared_version())
+
+        if PRECOMPUTED_SUMMARY:
+            # The database already folded the new rows in; re-read only the employees they touched
+            updated = fetch_employee_summary(since_performance_id=last_performance_id)
+            if updated.empty:
+                return 0
+            updated = finalize_summary(preprocess_employee_summary(updated))
+            publish_data(df_raw, replace_summary_rows(df_summary, updated), changed_employee_ids=updated['employee_id'].to_numpy(),
+                         partials=get_precomputed_partials())
+            last_performance_id = int(updated['max_performance_id'].max())
+            print(f"Refreshed summaries for {len(updated)} employees.")
+            return len(updated)
+
+        df_new = fetch_employee_performance_data(since_performance_id=last_performance_id)
+        if df_new.empty:
+            return 0
+
+        df_new = preprocess_performance_data(df_new)
+        new_summary = merge_performance_updates(df_summary, df_new)
+        if COMPACT_LOAD:
+            df_new = compact_frame(df_new[list(PERFORMANCE_DTYPES)].copy(), PERFORMANCE_DTYPES)
+
+        # Fold the new rows into the existing trend order and monthly buckets instead of rebuilding them
+        with time_stage('trend_index'):
+            new_trend_index = trend_index.merged(df_new)
+        with time_stage('monthly_rollup'):
+            new_rollup_buckets = monthly_rollup.merge_buckets(df_new)
+        # Past the load only the derived structures read the raw rows, so rather than copying every raw
+        # row into a concatenated frame, the merged trend rows stand in for df_raw (as in shared mode)
+        publish_data(new_trend_index.ordered, new_summary, new_trend_index, new_rollup_buckets,
+                     changed_employee_ids=df_new['employee_id'].unique())
+        last_performance_id = int(df_new['performance_id'].max())
+        print(f"Merged {len(df_new)} new performance records.")
+        return len(df_new)
+
+def _refresh_loop(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            refresh_data()
+        except Exception as e:
+            print(f"Error refreshing data: {e}")
+
+def start_background_refresh(interval=REFRESH_INTERVAL_SECONDS):
+    """Starts a daemon thread that periodically calls refresh_data()."""
+    thread = threading.Thread(target=_refresh_loop, args=(interval,), name='data-refresher', daemon=True)
+    thread.start()
+    return thread
+
+def _warmup():
+    global last_performance_id
+    warmup_status['state'] = 'loading'
+    try:
+        if SHARED_DATA_ROLE == 'worker':
+            set_warmup_stage('waiting for shared data')
+            while not attach_shared_version():
+                time.sleep(1)
+            summary = df_summary
+        else:
+            raw, summary = get_processed_data()
+            set_warmup_stage('indexing')
+            publish_data(raw, summary, partials=get_precomputed_partials())
+            last_performance_id = int(summary['max_performance_id'].max()) if not summary.empty else 0
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        warmup_status.update(state='error', error=str(e), finished_at=time.time())
+        return
+
+    # Check if data is loaded
+    if summary.empty:
+        print("Dashboard will show no data due to empty DataFrames.")
+    warmup_status.update(state='ready', stage='ready', finished_at=time.time())
+    start_background_refresh()
+
+def start_warmup():
+    """Loads the data on a daemon thread, then starts the periodic refresher."""
+    warmup_status['started_at'] = time.time()
+    thread = threading.Thread(target=_warmup, name='data-warmup', daemon=True)
+    thread.start()
+    return thread
+
+start_warmup()
 
 # --- Dashboard Layout ---
-app.layout = html.Div(style={'fontFamily': 'Times new roman, sans-serif'}, children=[
-    html.H1("Employee Performance Dashboard", style={'textAlign': 'center', 'color': '#2C3E50'}),
-
-    html.Div(style={'display': 'flex', 'justifyContent': 'space-around', 'padding': '20px', 'backgroundColor': "#59B8D0", 'borderRadius': '8px', 'marginBottom': '20px'}, children=[
-        html.Div(children=[
-            html.H3("Filter by Department"),
-            dcc.Dropdown(
-                id='department-dropdown',
-                options=[{'label': i, 'value': i} for i in df_summary['department'].unique()] if not df_summary.empty else [],
-                placeholder="Select Department",
-                multi=True,
-                style={'width': '300px'}
-            )
+def build_period_slider(rollup):
+    # One step per month of data; the full range (the default) means all records
+    month_range = rollup.month_range
+    if month_range is None:
+        return dcc.RangeSlider(id='period-slider', min=0, max=0, step=1, value=[0, 0], disabled=True)
+    first_month, last_month = month_range
+    mark_step = max(1, (last_month - first_month + 1) // 8)
+    return dcc.RangeSlider(
+        id='period-slider',
+        min=first_month,
+        max=last_month,
+        step=1,
+        value=[first_month, last_month],
+        marks={month: month_label(month) for month in range(first_month, last_month + 1, mark_step)},
+        allowCross=False
+    )
+
+def build_dashboard_layout(summary, rollup):
+    """Builds the dashboard components, with dropdown options taken from summary and the period range from rollup."""
+    return html.Div(style={'fontFamily': 'Times new roman, sans-serif'}, children=[
+        html.H1("Employee Performance Dashboard", style={'textAlign': 'center', 'color': '#2C3E50'}),
+
+        html.Div(style={'display': 'flex', 'justifyContent': 'space-around', 'padding': '20px', 'backgroundColor': "#59B8D0", 'borderRadius': '8px', 'marginBottom': '20px'}, children=[
+            html.Div(children=[
+                html.H3("Filter by Department"),
+                dcc.Dropdown(
+                    id='department-dropdown',
+                    options=[{'label': i, 'value': i} for i in summary['department'].unique()] if not summary.empty else [],
+                    placeholder="Select Department",
+                    multi=True,
+                    style={'width': '300px'}
+                )
+            ]),
+            html.Div(children=[
+                html.H3("Filter by Position"),
+                dcc.Dropdown(
+                    id='position-dropdown',
+                    options=[{'label': i, 'value': i} for i in summary['position'].unique()] if not summary.empty else [],
+                    placeholder="Select Position",
+                    multi=True,
+                    style={'width': '300px'}
+                )
+            ]),
+            html.Div(children=[
+                html.H3("Filter by Period"),
+                html.Div(build_period_slider(rollup), style={'width': '400px'})
+            ])
+        ], id='filter-div'),
+
+        html.Div(className='row', style={'display': 'flex', 'flexWrap': 'wrap'}, children=[
+            html.Div(className='four columns', style={'flex': '1', 'minWidth': '45%', 'margin': '10px', 'padding': '20px', 'border': '1px solid #CCC', 'borderRadius': '8px', 'boxShadow': '2px 2px 5px rgba(0,0,0,0.1)'}, children=[
+                html.H2("Overall Performance Metrics (Avg)", style={'textAlign': 'center'}),
+                dcc.Graph(id='overall-kpi-attendance-appraisal-bar')
+            ]),
+            html.Div(className='four columns', style={'flex': '1', 'minWidth': '45%', 'margin': '10px', 'padding': '20px', 'border': '1px solid #CCC', 'borderRadius': '8px', 'boxShadow': '2px 2px 5px rgba(0,0,0,0.1)'}, children=[
+                html.H2("Performance by Department", style={'textAlign': 'center'}),
+                dcc.Graph(id='kpi-by-department-bar')
+            ])
         ]),
-        html.Div(children=[
-            html.H3("Filter by Position"),
-            dcc.Dropdown(
-                id='position-dropdown',
-                options=[{'label': i, 'value': i} for i in df_summary['position'].unique()] if not df_summary.empty else [],
-                placeholder="Select Position",
-                multi=True,
-                style={'width': '300px'}
-            )
-        ])
-    ], id='filter-div'),
 
-    html.Div(className='row', style={'display': 'flex', 'flexWrap': 'wrap'}, children=[
-        html.Div(className='four columns', style={'flex': '1', 'minWidth': '45%', 'margin': '10px', 'padding': '20px', 'border': '1px solid #CCC', 'borderRadius': '8px', 'boxShadow': '2px 2px 5px rgba(0,0,0,0.1)'}, children=[
-            html.H2("Overall Performance Metrics (Avg)", style={'textAlign': 'center'}),
-            dcc.Graph(id='overall-kpi-attendance-appraisal-bar')
+        html.Div(className='row', style={'display': 'flex', 'flexWrap': 'wrap'}, children=[
+            html.Div(className='four columns', style={'flex': '1', 'minWidth': '45%', 'margin': '10px', 'padding': '20px', 'border': '1px solid #CCC', 'borderRadius': '8px', 'boxShadow': '2px 2px 5px rgba(0,0,0,0.1)'}, children=[
+                html.H2("Top 10 Performers (Avg KPI)", style={'textAlign': 'center'}),
+                dcc.Graph(id='top-performers-kpi')
+            ]),  
+            html.Div(className='four columns', style={'flex': '1', 'minWidth': '45%', 'margin': '10px', 'padding': '20px', 'border': '1px solid #CCC', 'borderRadius': '8px', 'boxShadow': '2px 2px 5px rgba(0,0,0,0.1)'}, children=[
+                html.H2("Bottom 10 Performers (Avg KPI)", style={'textAlign': 'center'}),
+                dcc.Graph(id='bottom-performers-kpi')
+            ])
         ]),
-        html.Div(className='four columns', style={'flex': '1', 'minWidth': '45%', 'margin': '10px', 'padding': '20px', 'border': '1px solid #CCC', 'borderRadius': '8px', 'boxShadow': '2px 2px 5px rgba(0,0,0,0.1)'}, children=[
-            html.H2("Performance by Department", style={'textAlign': 'center'}),
-            dcc.Graph(id='kpi-by-department-bar')
-        ])
-    ]),
-
-    html.Div(className='row', style={'display': 'flex', 'flexWrap': 'wrap'}, children=[
-        html.Div(className='four columns', style={'flex': '1', 'minWidth': '45%', 'margin': '10px', 'padding': '20px', 'border': '1px solid #CCC', 'borderRadius': '8px', 'boxShadow': '2px 2px 5px rgba(0,0,0,0.1)'}, children=[
-            html.H2("Top 10 Performers (Avg KPI)", style={'textAlign': 'center'}),
-            dcc.Graph(id='top-performers-kpi')
-        ]),  
-        html.Div(className='four columns', style={'flex': '1', 'minWidth': '45%', 'margin': '10px', 'padding': '20px', 'border': '1px solid #CCC', 'borderRadius': '8px', 'boxShadow': '2px 2px 5px rgba(0,0,0,0.1)'}, children=[
-            html.H2("Bottom 10 Performers (Avg KPI)", style={'textAlign': 'center'}),
-            dcc.Graph(id='bottom-performers-kpi')
-        ])
-    ]),
 
-    html.Div(className='row', style={'display': 'flex', 'flexWrap': 'wrap'}, children=[
-        html.Div(className='four columns', style={'flex': '1', 'minWidth': '45%', 'margin': '10px', 'padding': '20px', 'border': '1px solid #CCC', 'borderRadius': '8px', 'boxShadow': '2px 2px 5px rgba(0,0,0,0.1)'}, children=[
-            html.H2("Appraisal Rating Distribution", style={'textAlign': 'center'}),
-            dcc.Graph(id='appraisal-distribution-pie')
+        html.Div(className='row', style={'display': 'flex', 'flexWrap': 'wrap'}, children=[
+            html.Div(className='four columns', style={'flex': '1', 'minWidth': '45%', 'margin': '10px', 'padding': '20px', 'border': '1px solid #CCC', 'borderRadius': '8px', 'boxShadow': '2px 2px 5px rgba(0,0,0,0.1)'}, children=[
+                html.H2("Appraisal Rating Distribution", style={'textAlign': 'center'}),
+                dcc.Graph(id='appraisal-distribution-pie')
+            ]),
+            html.Div(className='four columns', style={'flex': '1', 'minWidth': '45%', 'margin': '10px', 'padding': '20px', 'border': '1px solid #CCC', 'borderRadius': '8px', 'boxShadow': '2px 2px 5px rgba(0,0,0,0.1)'}, children=[
+                html.H2("Attendance Score Distribution", style={'textAlign': 'center'}),
+                dcc.Graph(id='attendance-distribution-hist')
+            ])
         ]),
-        html.Div(className='four columns', style={'flex': '1', 'minWidth': '45%', 'margin': '10px', 'padding': '20px', 'border': '1px solid #CCC', 'borderRadius': '8px', 'boxShadow': '2px 2px 5px rgba(0,0,0,0.1)'}, children=[
-            html.H2("Attendance Score Distribution", style={'textAlign': 'center'}),
-            dcc.Graph(id='attendance-distribution-hist')
-        ])
-    ]),
-
-    html.Div(className='row', style={'display': 'flex', 'flexWrap': 'wrap'}, children=[
-        html.Div(className='twelve columns', style={'width': '100%', 'margin': '10px', 'padding': '20px', 'border': '1px solid #CCC', 'borderRadius': '8px', 'boxShadow': '2px 2px 5px rgba(0,0,0,0.1)'}, children=[
-            html.H2("Employee Performance Trends (by selected employee)", style={'textAlign': 'center'}),
-            dcc.Dropdown(
-                id='employee-trend-dropdown',
-                options=[{'label': row['full_name'], 'value': row['employee_id']} for index, row in df_summary.iterrows()] if not df_summary.empty else [],
-                placeholder="Select an Employee",
-                style={'width': '50%'}
-            ),
-            dcc.Graph(id='employee-performance-trend')
+
+        html.Div(className='row', style={'display': 'flex', 'flexWrap': 'wrap'}, children=[
+            html.Div(className='twelve columns', style={'width': '100%', 'margin': '10px', 'padding': '20px', 'border': '1px solid #CCC', 'borderRadius': '8px', 'boxShadow': '2px 2px 5px rgba(0,0,0,0.1)'}, children=[
+                html.H2("Employee Performance Trends (by selected employee)", style={'textAlign': 'center'}),
+                # Options are filled by search_employees as the user types, so the layout does not grow with headcount
+                dcc.Dropdown(
+                    id='employee-trend-dropdown',
+                    options=[],
+                    placeholder="Search an employee by name or email",
+                    style={'width': '50%'}
+                ),
+                dcc.Graph(id='employee-performance-trend')
+            ])
         ])
     ])
-])
+
+def get_dashboard_layout():
+    # Built once per data version, on the first page load after it was published
+    global _dashboard_layout
+    with _layout_lock:
+        if _dashboard_layout is None:
+            _dashboard_layout = build_dashboard_layout(df_summary, monthly_rollup)
+        return _dashboard_layout
+
+def build_loading_message():
+    elapsed = time.time() - warmup_status['started_at']
+    if warmup_status['state'] == 'error':
+        message = f"Loading data failed: {warmup_status['error']}"
+    else:
+        message = f"Loading data ({warmup_status['stage']}, {elapsed:.0f}s elapsed)..."
+    return html.Div(style={'fontFamily': 'Times new roman, sans-serif'}, children=[
+        html.H1("Employee Performance Dashboard", style={'textAlign': 'center', 'color': '#2C3E50'}),
+        html.P(message, style={'textAlign': 'center', 'color': 'grey'})
+    ])
+
+def serve_layout():
+    # Evaluated per page load, so the first byte never waits for the data
+    ready = warmup_status['state'] == 'ready'
+    return html.Div(children=[
+        dcc.Interval(id='warmup-interval', interval=1000, disabled=ready),
+        html.Div(id='page-content', children=get_dashboard_layout() if ready else build_loading_message())
+    ])
+
+app.layout = serve_layout
+# Lets Dash validate the dashboard callbacks before their components are on the page
+app.validation_layout = html.Div([serve_layout(), build_dashboard_layout(pd.DataFrame(), MonthlyRollup(pd.DataFrame(), pd.DataFrame()))])
+
+# --- Response Payload Sizes ---
+# Body size of the callback responses carrying figures, to check how much binning and downsampling save;
+# taken from the responses Dash already serialized (see finish_callback_request)
+payload_sizes = {}
+_payload_sizes_lock = threading.Lock()
+# Callbacks measured, by the id of one of their outputs
+PAYLOAD_CALLBACKS = {'overall-kpi-attendance-appraisal-bar': 'dashboard', 'employee-performance-trend': 'employee_trend'}
+
+def payload_callback(body):
+    """Returns the PAYLOAD_CALLBACKS name of a /_dash-update-component request body, or None."""
+    outputs = (body or {}).get('outputs')
+    for output in outputs if isinstance(outputs, list) else [outputs]:
+        component_id = output.get('id') if isinstance(output, dict) else None
+        if isinstance(component_id, str) and component_id in PAYLOAD_CALLBACKS:
+            return PAYLOAD_CALLBACKS[component_id]
+    return None
+
+def record_payload_size(name, size):
+    with _payload_sizes_lock:
+        stats = payload_sizes.setdefault(name, {'responses': 0, 'last_bytes': 0, 'max_bytes': 0, 'total_bytes': 0})
+        stats['responses'] += 1
+        stats['last_bytes'] = size
+        stats['max_bytes'] = max(stats['max_bytes'], size)
+        stats['total_bytes'] += size
 
 # --- Callbacks for Interactivity ---
 
+@app.callback(
+    Output('page-content', 'children'),
+    Output('warmup-interval', 'disabled'),
+    Input('warmup-interval', 'n_intervals'),
+    prevent_initial_call=True
+)
+def poll_warmup(n_intervals):
+    # Swap the loading message for the dashboard once the warmup finished
+    if warmup_status['state'] == 'ready':
+        return get_dashboard_layout(), True
+    return build_loading_message(), warmup_status['state'] == 'error'
+
 @app.callback(
     Output('overall-kpi-attendance-appraisal-bar', 'figure'),
     Output('kpi-by-department-bar', 'figure'),
@@ -139,27 +515,136 @@ app.layout = html.Div(style={'fontFamily': 'Times new roman, sans-serif'}, child
     Output('appraisal-distribution-pie', 'figure'),
     Output('attendance-distribution-hist', 'figure'),
     Input('department-dropdown', 'value'),
-    Input('position-dropdown', 'value')
+    Input('position-dropdown', 'value'),
+    Input('period-slider', 'value')
 )
-def update_dashboard(selected_departments, selected_positions):
-    filtered_df_summary = df_summary.copy()
-
-    if selected_departments:
-        filtered_df_summary = filtered_df_summary[filtered_df_summary['department'].isin(selected_departments)]
-    if selected_positions:
-        filtered_df_summary = filtered_df_summary[filtered_df_summary['position'].isin(selected_positions)]
+def update_dashboard(selected_departments, selected_positions, selected_period=None):
+    # Figures depend only on the normalized selection and the data version, so popular selections are served from the cache
+    with time_stage('update_dashboard'):
+        index, window = get_period_index(selected_period)
+        cache_key = (index.version, window, normalize_selection(selected_departments), normalize_selection(selected_positions))
+        figures = figure_cache.get(cache_key)
+        if figures is None:
+            if PUSHDOWN_QUERIES:
+                figures = build_pushdown_figures(selected_departments, selected_positions)
+            else:
+                figures = build_dashboard_figures(index, selected_departments, selected_positions)
+            figure_cache.put(cache_key, figures)
+        return figures
+
+def get_period_index(selected_period):
+    """Returns (filter index, window) for a period slider value; window is None for all records.
+
+    A narrower window gets a summary combined from the monthly rollup and its
+    own filter index, both cached per window for the current data version.
+    """
+    rollup, index = monthly_rollup, summary_index
+    if not selected_period or rollup.month_range is None:
+        return index, None
+    window = (max(int(selected_period[0]), rollup.month_range[0]), min(int(selected_period[1]), rollup.month_range[1]))
+    if window == rollup.month_range:
+        return index, None
+
+    cache_key = (rollup.version, window)
+    window_index = window_index_cache.get(cache_key)
+    if window_index is None:
+        with time_stage('window_summary'):
+            window_index = SummaryFilterIndex(rollup.window_summary(*window), version=rollup.version)
+        window_index_cache.put(cache_key, window_index)
+    return window_index, window
+
+def build_dashboard_figures(index, selected_departments, selected_positions):
+    # Resolve the selection through the prebuilt index instead of copying and scanning df_summary
+    with time_stage('filter'):
+        filtered_df_summary = index.subset(selected_departments, selected_positions)
 
     # Handle empty filtered data
     if filtered_df_summary.empty:
-        empty_figure = go.Figure().add_annotation(text="No data to display for the selected filters",
-                                                 xref="paper", yref="paper", showarrow=False,
-                                                 font=dict(size=20, color='grey'))
-        return empty_figure, empty_figure, empty_figure, empty_figure, empty_figure, empty_figure
+        return build_empty_figures()
+
+    top_performers, bottom_performers = rank_performers(filtered_df_summary, 'avg_kpi_score', 10)
+    # Counted and binned here so the payload holds one slice per rating and ATTENDANCE_BINS bars, not one value per employee
+    appraisal_counts = filtered_df_summary['latest_appraisal_rating'].dropna().astype(int).value_counts().sort_index()
+    attendance_histogram = score_histogram(filtered_df_summary['avg_attendance_score'], ATTENDANCE_BINS)
+    return render_dashboard_figures(
+        index.overall_averages(selected_departments, selected_positions),
+        index.department_averages(selected_departments, selected_positions),
+        top_performers, bottom_performers, appraisal_counts, attendance_histogram
+    )
 
+def build_pushdown_figures(selected_departments, selected_positions):
+    # The database aggregates the selection; only the numbers behind the figures are transferred
+    aggregates = fetch_dashboard_aggregates(selected_departments, selected_positions, top_n=10, histogram_bins=ATTENDANCE_BINS)
+    if not aggregates or aggregates['employees'] == 0:
+        return build_empty_figures()
+    return render_dashboard_figures(
+        aggregates['averages'], aggregates['department_averages'], aggregates['top'], aggregates['bottom'],
+        aggregates['appraisal_counts'], aggregates['attendance_histogram']
+    )
+
+def build_empty_figures():
+    empty_figure = go.Figure().add_annotation(text="No data to display for the selected filters",
+                                             xref="paper", yref="paper", showarrow=False,
+                                             font=dict(size=20, color='grey'))
+    return (empty_figure.to_dict(),) * 6
+
+def render_dashboard_figures(averages, kpi_by_department, top_performers, bottom_performers, appraisal_counts, attendance_histogram):
+    # The builders only read their own inputs, so they run side by side and
+    # the callback waits for the slowest one rather than the sum of all six.
+    # Most of a build is plotly's pure-Python figure construction, which holds
+    # the GIL, so only their numpy and pandas parts overlap; benchmark_end_to_end.py
+    # compares the pool with serial builds (FIGURE_BUILD_WORKERS = 0)
+    builds = [
+        (build_overall_metrics_figure, averages),
+        (build_department_figure, kpi_by_department),
+        (build_top_performers_figure, top_performers),
+        (build_bottom_performers_figure, bottom_performers),
+        (build_appraisal_distribution_figure, appraisal_counts),
+        (build_attendance_distribution_figure, *attendance_histogram)
+    ]
+    if figure_executor is None:
+        return tuple(timed_figure_build(*build) for build in builds)
+    global figures_warmed_up
+    if not figures_warmed_up:
+        with figure_warmup_lock:
+            if not figures_warmed_up:
+                figures = tuple(timed_figure_build(*build) for build in builds)
+                figures_warmed_up = True
+                return figures
+    futures = [figure_executor.submit(timed_figure_build, *build) for build in builds]
+    return tuple(future.result() for future in futures)
+
+def timed_figure_build(builder, *args):
+    with time_stage('figure_build', figure=builder.__name__.removeprefix('build_').removesuffix('_figure')):
+        return builder(*args)
+
+def rank_performers(summary, column, n):
+    """Returns (summary.nlargest(n, column), summary.nsmallest(n, column)) from one partial sort.
+
+    A single np.partition call finds both the n-th largest and the n-th smallest
+    value; only rows at or beyond those cut-offs are then fully sorted, keeping
+    the first occurrence on ties like nlargest/nsmallest do. Scores are
+    compared as score_keys, like the pushdown queries order them.
+    """
+    scores = score_keys(summary[column])
+    valid = np.flatnonzero(~np.isnan(scores))
+    if len(valid) <= n:
+        # Like nlargest/nsmallest, rows with missing values fill up the remaining places
+        missing = np.flatnonzero(np.isnan(scores))[:n - len(valid)]
+        top_rows = np.concatenate((valid[np.lexsort((valid, -scores[valid]))], missing))
+        bottom_rows = np.concatenate((valid[np.lexsort((valid, scores[valid]))], missing))
+        return summary.take(top_rows), summary.take(bottom_rows)
+
+    cutoffs = np.partition(scores[valid], [n - 1, len(valid) - n])
+    top_candidates = valid[scores[valid] >= cutoffs[len(valid) - n]]
+    bottom_candidates = valid[scores[valid] <= cutoffs[n - 1]]
+    top_rows = top_candidates[np.lexsort((top_candidates, -scores[top_candidates]))][:n]
+    bottom_rows = bottom_candidates[np.lexsort((bottom_candidates, scores[bottom_candidates]))][:n]
+    return summary.take(top_rows), summary.take(bottom_rows)
+
+def build_overall_metrics_figure(averages):
     # Overall Performance Metrics
-    avg_kpi = filtered_df_summary['avg_kpi_score'].mean()
-    avg_attendance = filtered_df_summary['avg_attendance_score'].mean()
-    avg_appraisal = filtered_df_summary['avg_appraisal_rating'].mean()
+    avg_kpi, avg_attendance, avg_appraisal = averages
 
     overall_metrics_fig = px.bar(
         x=['Avg KPI Score', 'Avg Attendance Score', 'Avg Appraisal Rating'],
@@ -169,9 +654,10 @@ def update_dashboard(selected_departments, selected_positions):
         color_discrete_sequence=px.colors.qualitative.Pastel
     )
     overall_metrics_fig.update_yaxes(range=[0, 1] if any(m in ['Avg KPI Score', 'Avg Attendance Score'] for m in overall_metrics_fig.data[0].x) else [0, 5])
+    return overall_metrics_fig.to_dict()
 
+def build_department_figure(kpi_by_department):
     # KPI by Department
-    kpi_by_department = filtered_df_summary.groupby('department')['avg_kpi_score'].mean().reset_index()
     kpi_by_department_fig = px.bar(
         kpi_by_department,
         x='department',
@@ -182,9 +668,10 @@ def update_dashboard(selected_departments, selected_positions):
         color_discrete_sequence=px.colors.qualitative.Set2
     )
     kpi_by_department_fig.update_yaxes(range=[0, 1])
+    return kpi_by_department_fig.to_dict()
 
+def build_top_performers_figure(top_performers):
     # Top N Performers (by average KPI)
-    top_performers = filtered_df_summary.nlargest(10, 'avg_kpi_score')
     top_performers_fig = px.bar(
         top_performers,
         x='full_name',
@@ -195,9 +682,10 @@ def update_dashboard(selected_departments, selected_positions):
         color_continuous_scale=px.colors.sequential.Greens
     )
     top_performers_fig.update_yaxes(range=[0, 1])
+    return top_performers_fig.to_dict()
 
+def build_bottom_performers_figure(bottom_performers):
     # Bottom N Performers (by average KPI)
-    bottom_performers = filtered_df_summary.nsmallest(10, 'avg_kpi_score')
     bottom_performers_fig = px.bar(
         bottom_performers,
         x='full_name',
@@ -208,36 +696,50 @@ def update_dashboard(selected_departments, selected_positions):
         color_continuous_scale=px.colors.sequential.Reds
     )
     bottom_performers_fig.update_yaxes(range=[0, 1])
+    return bottom_performers_fig.to_dict()
 
-    # Appraisal Rating Distribution
+def build_appraisal_distribution_figure(appraisal_counts):
+    # Appraisal Rating Distribution, from the employee count per latest rating
     appraisal_distribution_fig = px.pie(
-        filtered_df_summary,
-        names='latest_appraisal_rating', # Using latest for a snapshot
+        names=appraisal_counts.index.astype(str), # Using latest for a snapshot
+        values=appraisal_counts.to_numpy(),
         title='Appraisal Rating Distribution',
         color_discrete_sequence=px.colors.qualitative.Vivid
     )
-    appraisal_distribution_fig.update_traces(textinfo='percent+label', pull=[0.05 if str(x) == str(filtered_df_summary['latest_appraisal_rating'].mode()[0]) else 0 for x in appraisal_distribution_fig.data[0].labels]) # Highlight mode
-
-    # Attendance Score Distribution (Histogram)
-    attendance_distribution_hist = px.histogram(
-        filtered_df_summary,
-        x='avg_attendance_score',
-        nbins=10,
+    most_common_rating = str(appraisal_counts.idxmax()) if not appraisal_counts.empty else None
+    appraisal_distribution_fig.update_traces(textinfo='percent+label', pull=[0.05 if x == most_common_rating else 0 for x in appraisal_distribution_fig.data[0].labels]) # Highlight mode
+    return appraisal_distribution_fig.to_dict()
+
+def build_attendance_distribution_figure(bin_counts, bin_edges):
+    # Attendance Score Distribution, drawn from precomputed bins
+    attendance_distribution_hist = px.bar(
+        x=(bin_edges[:-1] + bin_edges[1:]) / 2,
+        y=bin_counts,
         title='Attendance Score Distribution',
-        labels={'avg_attendance_score': 'Average Attendance Score'},
+        labels={'x': 'Average Attendance Score', 'y': 'count'},
         color_discrete_sequence=px.colors.qualitative.D3 # Use a qualitative color scale
     )
+    attendance_distribution_hist.update_traces(width=np.diff(bin_edges))
     attendance_distribution_hist.update_xaxes(range=[0, 1]) # Set range for attendance scores
+    return attendance_distribution_hist.to_dict()
 
-
-    return (
-        overall_metrics_fig,
-        kpi_by_department_fig,
-        top_performers_fig,
-        bottom_performers_fig,
-        appraisal_distribution_fig,
-        attendance_distribution_hist
-    )
+@app.callback(
+    Output('employee-trend-dropdown', 'options'),
+    Input('employee-trend-dropdown', 'search_value'),
+    State('employee-trend-dropdown', 'value')
+)
+def search_employees(search_value, selected_employee_id):
+    # Clearing the search box must not drop the option of the employee being shown
+    if not search_value:
+        raise PreventUpdate
+    search = employee_search
+    with time_stage('employee_search'):
+        options = search.search(search_value, limit=EMPLOYEE_SEARCH_LIMIT)
+    if selected_employee_id is not None and all(option['value'] != selected_employee_id for option in options):
+        selected_option = search.option(selected_employee_id)
+        if selected_option is not None:
+            options.append(selected_option)
+    return options
 
 @app.callback(
     Output('employee-performance-trend', 'figure'),
@@ -249,24 +751,32 @@ def update_employee_trend(selected_employee_id):
                                          xref="paper", yref="paper", showarrow=False,
                                          font=dict(size=16, color='grey'))
 
-    employee_df = df_raw[df_raw['employee_id'] == selected_employee_id].sort_values('performance_date')
+    with time_stage('trend_lookup'):
+        if PRECOMPUTED_SUMMARY:
+            employee_df = fetch_employee_performance_history(selected_employee_id)
+            if not employee_df.empty:
+                employee_df = preprocess_performance_data(employee_df)
+        else:
+            # Constant-time slice of the date-ordered copy instead of scanning and sorting df_raw
+            employee_df = trend_index.lookup(selected_employee_id)
 
     if employee_df.empty:
         return go.Figure().add_annotation(text="No performance data available for this employee.",
                                          xref="paper", yref="paper", showarrow=False,
                                          font=dict(size=16, color='grey'))
 
+    # Names live on the summary so the compact df_raw does not need to repeat them per record
+    employee_name = summary_index.full_name(selected_employee_id)
+
     fig = go.Figure()
 
-    fig.add_trace(go.Scatter(x=employee_df['performance_date'], y=employee_df['kpi_score'],
-                             mode='lines+markers', name='KPI Score'))
-    fig.add_trace(go.Scatter(x=employee_df['performance_date'], y=employee_df['attendance_score'],
-                             mode='lines+markers', name='Attendance Score'))
-    fig.add_trace(go.Scatter(x=employee_df['performance_date'], y=employee_df['appraisal_rating'],
-                             mode='lines+markers', name='Appraisal Rating'))
+    # WebGL traces keep long histories responsive in the browser
+    for column, name in [('kpi_score', 'KPI Score'), ('attendance_score', 'Attendance Score'), ('appraisal_rating', 'Appraisal Rating')]:
+        dates, values = downsample_trend(employee_df['performance_date'], employee_df[column])
+        fig.add_trace(go.Scattergl(x=dates, y=values, mode='lines+markers', name=name))
 
     fig.update_layout(
-        title=f"Performance Trend for {employee_df['first_name'].iloc[0]} {employee_df['last_name'].iloc[0]}",
+        title=f"Performance Trend for {employee_name}",
         xaxis_title="Performance Date",
         yaxis_title="Score/Rating",
         hovermode="x unified"
@@ -276,6 +786,78 @@ def update_employee_trend(selected_employee_id):
 
     return fig
 
+def downsample_trend(dates, values, max_points=TREND_MAX_POINTS):
+    """Drops missing values and, past max_points, keeps the LTTB selection of the series."""
+    present = values.notna().to_numpy()
+    dates = dates.to_numpy()[present]
+    values = values.to_numpy()[present]
+    if max_points and len(values) > max_points:
+        selected = lttb_indices(dates.astype('datetime64[ns]').astype('int64'), values, max_points)
+        dates, values = dates[selected], values[selected]
+    return dates, values
+
+@app.server.route('/ready')
+def ready():
+    """Readiness probe: 200 once the data is loaded, 503 with load progress before that."""
+    status = dict(warmup_status)
+    status['elapsed_seconds'] = round((status['finished_at'] or time.time()) - status['started_at'], 2)
+    status['employees'] = len(df_summary)
+    status['performance_records'] = len(df_raw)
+    return flask.jsonify(status), 200 if status['state'] == 'ready' else 503
+
+@app.server.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint: stage latencies, rows fetched, figure cache and payload statistics."""
+    cache = figure_cache.stats()
+    samples = [
+        ('employee_dashboard_figure_cache_entries', 'gauge', 'Selections held in the figure cache.', cache['entries'], {}),
+        ('employee_dashboard_figure_cache_hits_total', 'counter', 'Dashboard requests served from the figure cache.', cache['hits'], {}),
+        ('employee_dashboard_figure_cache_misses_total', 'counter', 'Dashboard requests that built their figures.', cache['misses'], {}),
+        ('employee_dashboard_figure_cache_evictions_total', 'counter', 'Selections evicted from the figure cache.', cache['evictions'], {}),
+        ('employee_dashboard_employees', 'gauge', 'Employees in the loaded summary.', len(df_summary), {}),
+        ('employee_dashboard_data_version', 'gauge', 'Number of data swaps since start.', data_version, {})
+    ]
+    with _payload_sizes_lock:
+        sizes = {name: dict(stats) for name, stats in payload_sizes.items()}
+    for name, stats in sorted(sizes.items()):
+        labels = {'callback': name}
+        samples += [
+            ('employee_dashboard_responses_total', 'counter', 'Figure responses returned, per callback.', stats['responses'], labels),
+            ('employee_dashboard_response_bytes_total', 'counter', 'Response body bytes returned, per callback.', stats['total_bytes'], labels),
+            ('employee_dashboard_response_max_bytes', 'gauge', 'Largest response body, per callback.', stats['max_bytes'], labels)
+        ]
+    return flask.Response(registry.render(samples), mimetype='text/plain; version=0.0.4')
+
+# --- Optional Request Profiling ---
+# With EMPLOYEE_DASHBOARD_PROFILE_DIR set, every callback request is run under cProfile
+# and its stats dumped there, one .prof file per request (open with pstats or snakeviz)
+@app.server.before_request
+def start_request_profile():
+    if not PROFILE_DIR or flask.request.path != '/_dash-update-component':
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError: # Another profiler is already active (e.g. a concurrent request on Python 3.12+)
+        return
+    flask.g.profiler = profiler
+
+@app.server.after_request
+def finish_callback_request(response):
+    if flask.request.path != '/_dash-update-component':
+        return response
+    # Content-Length of the body Dash serialized, so figures are not serialized a second time to be measured
+    name = payload_callback(flask.request.get_json(silent=True))
+    if name is not None and response.status_code == 200 and response.content_length is not None:
+        record_payload_size(name, response.content_length)
+
+    profiler = flask.g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        profiler.dump_stats(os.path.join(PROFILE_DIR, f'callback-{time.time_ns()}-{threading.get_ident()}.prof'))
+    return response
+
 # Run the Dash app
 if __name__ == '__main__':
-    app.run_server(debug=True, port=8050)
\ No newline at end of file
+    app.run_server(debug=True, port=8050)
\ No newline at end of file
@@ -0,0 +1,85 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+from data_processing import preprocess_performance_data, aggregate_performance, finalize_summary
+
+# Performance rows per synthetic frame; override with e.g. `python benchmark_aggregation.py 10000 50000`
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+RECORDS_PER_EMPLOYEE = 6 # Same default as generate_dummy_data
+
+def make_synthetic_frame(num_rows, seed=42):
+    """Builds a frame shaped like fetch_employee_performance_data() output (newest record first per employee)."""
+    rng = np.random.default_rng(seed)
+    num_employees = max(1, num_rows // RECORDS_PER_EMPLOYEE)
+    employee_ids = np.sort(rng.integers(1, num_employees + 1, num_rows))
+
+    departments = np.array(['HR', 'Engineering', 'Sales', 'Marketing', 'Finance', 'Operations', 'IT', 'Customer Service'])
+    positions = np.array(['Analyst', 'Engineer', 'Manager', 'Specialist', 'Director', 'Associate', 'Developer', 'Designer', 'Coordinator'])
+    today = np.datetime64('today', 'D')
+
+    df = pd.DataFrame({
+        'employee_id': employee_ids,
+        'first_name': 'First' + pd.Series(employee_ids).astype(str),
+        'last_name': 'Last' + pd.Series(employee_ids).astype(str),
+        'department': departments[employee_ids % len(departments)],
+        'position': positions[employee_ids % len(positions)],
+        'hire_date': today - (365 + employee_ids % 1460),
+        'salary': 40000 + (employee_ids % 80000).astype(float),
+        'email': 'employee' + pd.Series(employee_ids).astype(str) + '@example.com',
+        'performance_id': np.arange(1, num_rows + 1),
+        'kpi_score': rng.uniform(0.5, 1.0, num_rows).round(2),
+        'attendance_score': rng.uniform(0.7, 1.0, num_rows).round(2),
+        'appraisal_rating': rng.integers(1, 6, num_rows),
+        'feedback': 'Met expectations.',
+        'performance_date': today - rng.integers(30, 730, num_rows),
+    })
+    # Match the ORDER BY e.employee_id, p.performance_date DESC of the SQL query
+    df = df.sort_values(['employee_id', 'performance_date'], ascending=[True, False], ignore_index=True)
+    return preprocess_performance_data(df)
+
+def legacy_aggregate(df):
+    """The original groupby with per-group Python lambdas, kept as the reference path."""
+    employee_summary = df.groupby('employee_id').agg(
+        first_name=('first_name', 'first'),
+        last_name=('last_name', 'first'),
+        department=('department', 'first'),
+        position=('position', 'first'),
+        hire_date=('hire_date', 'first'),
+        salary=('salary', 'first'),
+        avg_kpi_score=('kpi_score', 'mean'),
+        avg_attendance_score=('attendance_score', 'mean'),
+        avg_appraisal_rating=('appraisal_rating', 'mean'),
+        latest_kpi_score=('kpi_score', lambda x: x.iloc[0] if not x.empty else None),
+        latest_attendance_score=('attendance_score', lambda x: x.iloc[0] if not x.empty else None),
+        latest_appraisal_rating=('appraisal_rating', lambda x: x.iloc[0] if not x.empty else None),
+        num_performance_records=('performance_id', 'count')
+    ).reset_index()
+
+    employee_summary['full_name'] = employee_summary['first_name'] + ' ' + employee_summary['last_name']
+    employee_summary['tenure'] = (pd.to_datetime('today') - employee_summary['hire_date']).dt.days / 365.25
+    return employee_summary
+
+def vectorized_aggregate(df):
+    return finalize_summary(aggregate_performance(df))
+
+def time_call(func, df):
+    start = time.perf_counter()
+    result = func(df)
+    return result, time.perf_counter() - start
+
+def run_benchmark(sizes):
+    print(f"{'rows':>10} {'employees':>10} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>8}")
+    for num_rows in sizes:
+        df = make_synthetic_frame(num_rows)
+        legacy, legacy_seconds = time_call(legacy_aggregate, df)
+        vectorized, vectorized_seconds = time_call(vectorized_aggregate, df)
+
+        # Both paths must produce the same summary for the columns the dashboard uses
+        pd.testing.assert_frame_equal(legacy, vectorized[legacy.columns], check_dtype=False)
+
+        print(f"{num_rows:>10} {len(vectorized):>10} {legacy_seconds:>12.3f} {vectorized_seconds:>15.3f} {legacy_seconds / vectorized_seconds:>7.1f}x")
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    run_benchmark(sizes)
@@ -0,0 +1,163 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import numpy as np
+from database_utils import configure_backend, SQLiteBackend, fetch_employee_performance_data, peak_rss_mb
+from generate_dummy_data import bulk_load_dummy_data, clear_tables, DEPARTMENTS, POSITIONS
+
+# Employee counts seeded and measured by default; override with --employees
+DEFAULT_SCALES = [1_000, 10_000, 100_000]
+PERCENTILES = [50, 95, 99]
+
+def summarize(samples):
+    """Returns count, mean, max and the PERCENTILES of a list of durations, in milliseconds."""
+    milliseconds = np.asarray(samples) * 1000
+    summary = {'count': len(samples), 'mean_ms': round(float(milliseconds.mean()), 3), 'max_ms': round(float(milliseconds.max()), 3)}
+    for percentile, value in zip(PERCENTILES, np.percentile(milliseconds, PERCENTILES)):
+        summary[f'p{percentile}_ms'] = round(float(value), 3)
+    return summary
+
+def time_repeated(func, repeats):
+    samples = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - start)
+    return result, samples
+
+def filter_selections(count, rng):
+    """A representative mix of dashboard selections: unfiltered, single departments and random combinations."""
+    selections = [(None, None)] + [([department], None) for department in DEPARTMENTS]
+    while len(selections) < count:
+        departments = rng.choice(DEPARTMENTS, rng.integers(1, 4), replace=False).tolist()
+        positions = rng.choice(POSITIONS, rng.integers(1, 3), replace=False).tolist() if rng.random() < 0.5 else None
+        selections.append((departments, positions))
+    return selections[:count]
+
+def seed_database(path, num_employees, records_per_employee, seed):
+    """Creates the SQLite stand-in with generate_dummy_data's schema, reusing it if already seeded at this scale."""
+    pool = configure_backend(SQLiteBackend(path))
+    with pool.connection() as connection:
+        counts = connection.execute("SELECT (SELECT COUNT(*) FROM employees), (SELECT COUNT(*) FROM performance)").fetchone()
+        if counts == (num_employees, num_employees * records_per_employee):
+            return 0.0
+        start = time.perf_counter()
+        clear_tables(connection)
+        bulk_load_dummy_data(connection, num_employees, records_per_employee, seed=seed)
+        return time.perf_counter() - start
+
+def run_scale(path, num_employees, settings):
+    """Seeds and benchmarks one scale; runs in a fresh process so peak memory is per scale."""
+    seed_seconds = seed_database(path, num_employees, settings['records_per_employee'], settings['seed'])
+
+    stages = {}
+    _, stages['fetch_employee_performance_data'] = time_repeated(fetch_employee_performance_data, settings['load_repeats'])
+
+    # Importing the app starts its background warmup; wait for it so the timings below do not race it
+    import app
+    while app.warmup_status['state'] not in ('ready', 'error'):
+        time.sleep(0.1)
+    (df_raw, df_summary), stages['get_processed_data'] = time_repeated(app.get_processed_data, settings['load_repeats'])
+    app.publish_data(df_raw, df_summary)
+
+    rng = np.random.default_rng(settings['seed'])
+    selections = filter_selections(settings['dashboard_requests'], rng)
+    figure_executor = app.figure_executor
+    # The same selections again with the six figures built one after another, to show what the figure pool saves
+    for stage, executor in (('update_dashboard', figure_executor), ('update_dashboard_serial', None)):
+        app.figure_executor = executor
+        stages[stage] = []
+        for departments, positions in selections:
+            # Measure building the figures, not serving them from the cache
+            app.figure_cache.clear()
+            start = time.perf_counter()
+            app.update_dashboard(departments, positions)
+            stages[stage].append(time.perf_counter() - start)
+    app.figure_executor = figure_executor
+
+    stages['update_employee_trend'] = []
+    for employee_id in rng.integers(1, num_employees + 1, settings['trend_requests']).tolist():
+        start = time.perf_counter()
+        app.update_employee_trend(employee_id)
+        stages['update_employee_trend'].append(time.perf_counter() - start)
+
+    peak = peak_rss_mb()
+    return {
+        'employees': num_employees,
+        'records_per_employee': settings['records_per_employee'],
+        'performance_records': len(df_raw),
+        'seed_seconds': round(seed_seconds, 3),
+        'peak_rss_mb': round(peak, 1) if peak is not None else None,
+        'stages': {name: summarize(samples) for name, samples in stages.items()}
+    }
+
+def print_results(result, baseline=None):
+    print(f"\n{result['employees']:,} employees x {result['records_per_employee']} records "
+          f"(peak RSS {result['peak_rss_mb']} MB, seeded in {result['seed_seconds']}s)")
+    print(f"{'stage':<32} {'p50 (ms)':>10} {'p95 (ms)':>10} {'p99 (ms)':>10} {'vs baseline p50':>16}")
+    for name, stage in result['stages'].items():
+        comparison = ''
+        if baseline and name in baseline['stages']:
+            comparison = f"{stage['p50_ms'] / baseline['stages'][name]['p50_ms']:.2f}x"
+        print(f"{name:<32} {stage['p50_ms']:>10.1f} {stage['p95_ms']:>10.1f} {stage['p99_ms']:>10.1f} {comparison:>16}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark data loading and dashboard callbacks against a seeded SQLite database.")
+    parser.add_argument('--employees', type=int, nargs='+', default=DEFAULT_SCALES, help="employee counts to benchmark, e.g. 1000 10000 100000 1000000")
+    parser.add_argument('--records-per-employee', type=int, default=6, help="performance records per employee")
+    parser.add_argument('--load-repeats', type=int, default=3, help="timed runs of the fetch and load stages")
+    parser.add_argument('--dashboard-requests', type=int, default=50, help="filter selections sent to update_dashboard")
+    parser.add_argument('--trend-requests', type=int, default=200, help="random employees sent to update_employee_trend")
+    parser.add_argument('--seed', type=int, default=42, help="seed for the data and the request mix")
+    parser.add_argument('--data-dir', help="keep the seeded databases here and reuse them across runs (default: a temporary directory)")
+    parser.add_argument('--output', help="write the results as JSON to this file")
+    parser.add_argument('--baseline', help="JSON output of an earlier run to compare p50 latencies against")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    settings = {
+        'records_per_employee': args.records_per_employee,
+        'load_repeats': args.load_repeats,
+        'dashboard_requests': args.dashboard_requests,
+        'trend_requests': args.trend_requests,
+        'seed': args.seed
+    }
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {(result['employees'], result['records_per_employee']): result for result in json.load(f)['results']}
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='employee-benchmark-')
+    os.makedirs(data_dir, exist_ok=True)
+    results = []
+    try:
+        for num_employees in args.employees:
+            path = os.path.join(data_dir, f'benchmark_{num_employees}x{args.records_per_employee}.sqlite3')
+            # Spawned, not forked, so every scale starts from a clean interpreter and its own peak RSS
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+                result = executor.submit(run_scale, path, num_employees, settings).result()
+            print_results(result, baseline.get((num_employees, args.records_per_employee)))
+            results.append(result)
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': sys.version.split()[0],
+                'platform': platform.platform(),
+                'settings': settings,
+                'results': results
+            }, f, indent=2)
+        print(f"\nWrote results to {args.output}")
@@ -0,0 +1,31 @@
+import time
+import pytest
+from database_utils import configure_backend, SQLiteBackend
+from generate_dummy_data import bulk_load_dummy_data, clear_tables
+
+NUM_EMPLOYEES = 200
+RECORDS_PER_EMPLOYEE = 6
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    """Imports the app against a seeded SQLite database and waits for its warmup.
+
+    The app is a module with global state and can only be imported once, so
+    every test module shares it; tests reload() it before relying on its data.
+    """
+    pool = configure_backend(SQLiteBackend(str(tmp_path_factory.mktemp('db') / 'app.sqlite3')))
+    with pool.connection() as connection:
+        clear_tables(connection)
+        bulk_load_dummy_data(connection, NUM_EMPLOYEES, RECORDS_PER_EMPLOYEE, seed=7)
+
+    import app # Importing starts the warmup, which loads from the pool configured above
+    while app.warmup_status['state'] not in ('ready', 'error'):
+        time.sleep(0.05)
+    assert app.warmup_status['state'] == 'ready'
+    return app, pool
+
+def reload(app):
+    """Loads the current database contents from scratch and publishes them, like a restart."""
+    df, summary = app.load_from_database()
+    app.publish_data(df, summary)
+    app.last_performance_id = int(summary['max_performance_id'].max())
@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+from trend_index import insert_rows
+
+METRIC_COLUMNS = ['kpi_score', 'attendance_score', 'appraisal_rating']
+ATTRIBUTE_COLUMNS = ['first_name', 'last_name', 'department', 'position', 'hire_date', 'salary', 'email']
+LATEST_COLUMNS = ['latest_kpi_score', 'latest_attendance_score', 'latest_appraisal_rating', 'latest_performance_date']
+# Running totals kept on each summary row so new records can be folded in without rescanning history
+TOTAL_COLUMNS = [f'sum_{m}' for m in METRIC_COLUMNS] + [f'count_{m}' for m in METRIC_COLUMNS] + ['num_performance_records']
+SUMMARY_COLUMNS = [
+    'employee_id', 'first_name', 'last_name', 'department', 'position', 'hire_date', 'salary', 'email',
+    'avg_kpi_score', 'avg_attendance_score', 'avg_appraisal_rating',
+    'latest_kpi_score', 'latest_attendance_score', 'latest_appraisal_rating',
+    'num_performance_records', 'full_name', 'tenure', 'latest_performance_date',
+    'sum_kpi_score', 'sum_attendance_score', 'sum_appraisal_rating',
+    'count_kpi_score', 'count_attendance_score', 'count_appraisal_rating', 'max_performance_id'
+]
+# Averages are ranked and binned as integer keys at this many decimals, in memory and in pushdown
+# queries alike, so the float noise of summing in a different order never decides a tie or a bin
+SCORE_DECIMALS = 9
+
+def score_keys(values):
+    """Returns averages scaled by 10**SCORE_DECIMALS and rounded to integers (as floats, NaN kept)."""
+    return np.rint(np.asarray(values, dtype=float) * 10 ** SCORE_DECIMALS)
+
+def histogram_edges(low_key, high_key, bins):
+    """Equal-width bin edges over [low_key, high_key] like np.histogram's, as integral score keys."""
+    if np.isnan(low_key):
+        low_key, high_key = 0.0, float(10 ** SCORE_DECIMALS)
+    if low_key == high_key:
+        low_key, high_key = low_key - 10 ** SCORE_DECIMALS / 2, high_key + 10 ** SCORE_DECIMALS / 2
+    return np.floor(np.linspace(low_key, high_key, bins + 1))
+
+def score_histogram(values, bins):
+    """np.histogram of averages over score keys; returns (counts, edges) with the edges as scores.
+
+    Bins are half-open except the last, matching the pushdown query's CASE expressions.
+    """
+    keys = score_keys(values)
+    keys = keys[~np.isnan(keys)]
+    edges = histogram_edges(keys.min() if len(keys) else np.nan, keys.max() if len(keys) else np.nan, bins)
+    counts, _ = np.histogram(keys, bins=edges)
+    return counts, edges / 10 ** SCORE_DECIMALS
+
+def tenure_years(hire_date):
+    """Years from hire_date (a datetime Series) to today; recomputed whenever frames are loaded, as it ages daily."""
+    return (pd.to_datetime('today') - hire_date).dt.days / 365.25
+
+def preprocess_performance_data(df):
+    """Converts data types and derives tenure on raw performance rows.
+
+    Works on both the joined frame and the compact performance-only frame
+    from the chunked loader (whose float32 scores are left as they are).
+    """
+    # Data type conversion
+    df['performance_date'] = pd.to_datetime(df['performance_date'])
+    wide_columns = [m for m in METRIC_COLUMNS if df[m].dtype != 'float32']
+    df[wide_columns] = df[wide_columns].astype(float)
+
+    if 'hire_date' in df:
+        df['hire_date'] = pd.to_datetime(df['hire_date'])
+        # Calculate tenure (in years)
+        df['tenure'] = tenure_years(df['hire_date'])
+    return df
+
+def aggregate_performance(df, employees=None):
+    """Reduces raw rows (newest first per employee) to per-employee attributes, latest values and running totals.
+
+    Everything is computed with vectorized groupby reductions; since rows arrive
+    newest first, the latest record of an employee is just their first row.
+    Attributes come from the rows themselves, or from the separate employees
+    frame when df is the compact performance-only frame.
+    """
+    grouped = df.groupby('employee_id', sort=True)
+
+    first_rows = df.drop_duplicates('employee_id').set_index('employee_id').sort_index()
+    if employees is not None:
+        employee_summary = employees.set_index('employee_id').reindex(first_rows.index)[ATTRIBUTE_COLUMNS]
+    else:
+        employee_summary = first_rows[ATTRIBUTE_COLUMNS].copy()
+    for metric in METRIC_COLUMNS:
+        employee_summary[f'latest_{metric}'] = first_rows[metric]
+    employee_summary['latest_performance_date'] = first_rows['performance_date']
+
+    sums = grouped[METRIC_COLUMNS].sum()
+    counts = grouped[METRIC_COLUMNS].count()
+    for metric in METRIC_COLUMNS:
+        employee_summary[f'sum_{metric}'] = sums[metric]
+        employee_summary[f'count_{metric}'] = counts[metric]
+    employee_summary['num_performance_records'] = grouped['performance_id'].count()
+    employee_summary['max_performance_id'] = grouped['performance_id'].max()
+
+    return employee_summary.reset_index()
+
+def preprocess_employee_summary(employee_summary):
+    """Converts data types on summary rows read from the database's employee_summary table."""
+    employee_summary['hire_date'] = pd.to_datetime(employee_summary['hire_date'])
+    employee_summary['latest_performance_date'] = pd.to_datetime(employee_summary['latest_performance_date'])
+    numeric_columns = LATEST_COLUMNS[:-1] + TOTAL_COLUMNS[:3]
+    employee_summary[numeric_columns] = employee_summary[numeric_columns].astype(float) # DECIMAL columns arrive as Decimal objects
+    return employee_summary
+
+def finalize_summary(employee_summary):
+    """Derives averages, full name and tenure from the aggregated per-employee rows."""
+    # For KPIs, appraisal, and attendance, we take the average across all records for an employee
+    for metric in METRIC_COLUMNS:
+        employee_summary[f'avg_{metric}'] = employee_summary[f'sum_{metric}'] / employee_summary[f'count_{metric}']
+
+    # astype(str) also covers categorical names, as in summaries attached from shared data
+    employee_summary['full_name'] = employee_summary['first_name'].astype(str) + ' ' + employee_summary['last_name'].astype(str)
+    employee_summary['tenure'] = tenure_years(employee_summary['hire_date'])
+
+    return employee_summary[SUMMARY_COLUMNS]
+
+def _summary_rows(employee_summary, employee_ids):
+    """Binary-searches employee_ids (sorted) in the id-ordered summary; returns (positions, existing).
+
+    positions[i] is the row of employee_ids[i], or where it would be inserted
+    when existing[i] is False.
+    """
+    summary_ids = employee_summary['employee_id'].to_numpy()
+    positions = np.searchsorted(summary_ids, employee_ids)
+    existing = positions < len(summary_ids)
+    existing[existing] = summary_ids[positions[existing]] == employee_ids[existing]
+    return positions, existing
+
+def merge_performance_updates(employee_summary, df_new):
+    """Folds newly fetched performance rows into an existing employee summary.
+
+    Only the employees that appear in df_new are re-aggregated: their running
+    totals are added to and their latest_* values replaced when a newer record
+    arrived, so the work is proportional to the number of new rows.
+    """
+    new_part = aggregate_performance(df_new)
+    if employee_summary.empty:
+        return finalize_summary(new_part)
+
+    positions, existing = _summary_rows(employee_summary, new_part['employee_id'].to_numpy())
+    # Old partials first so the freshly fetched partial wins ties below
+    combined = pd.concat([employee_summary.take(positions[existing])[new_part.columns], new_part], ignore_index=True)
+
+    grouped = combined.groupby('employee_id')
+    # Whole rows, not groupby().last(), which skips NaN and would keep an older non-null value
+    merged = combined.drop_duplicates('employee_id', keep='last').set_index('employee_id')[ATTRIBUTE_COLUMNS].sort_index()
+    merged[TOTAL_COLUMNS] = grouped[TOTAL_COLUMNS].sum()
+    merged['max_performance_id'] = grouped['max_performance_id'].max()
+    # On equal dates the new partial wins, like the summary trigger's >= comparison
+    latest = combined.sort_values(['employee_id', 'latest_performance_date'], kind='mergesort').drop_duplicates('employee_id', keep='last')
+    merged[LATEST_COLUMNS] = latest.set_index('employee_id')[LATEST_COLUMNS]
+    merged = finalize_summary(merged.reset_index())
+
+    return replace_summary_rows(employee_summary, merged)
+
+def replace_summary_rows(employee_summary, updated):
+    """Returns employee_summary with the rows for the employees in updated replaced (or added).
+
+    The rows to replace are found by binary search on the sorted employee_id
+    and overwritten by position in a copy of each column; employees seen for
+    the first time are inserted at their place in id order (see insert_rows).
+    Nothing is concatenated or re-sorted, and every column keeps its dtype.
+    """
+    if employee_summary.empty:
+        return updated
+    updated = updated.sort_values('employee_id', ignore_index=True)
+    positions, existing = _summary_rows(employee_summary, updated['employee_id'].to_numpy())
+
+    columns, new_rows = {}, {}
+    for column in employee_summary:
+        values, new_values = employee_summary[column], updated[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Labels seen for the first time join the categories, kept sorted like a fresh load's
+            labels = pd.Index(new_values.dropna().unique()).difference(values.cat.categories)
+            if len(labels):
+                values = values.cat.set_categories(values.cat.categories.union(labels))
+        if isinstance(values.dtype, np.dtype):
+            array, new_array = values.to_numpy(copy=True), new_values.to_numpy(dtype=values.dtype)
+        else:
+            # Strings and categoricals stay extension arrays; converting them to objects and back costs more than the copy
+            array, new_array = values.array.copy(), new_values.astype(values.dtype).array
+        array[positions[existing]] = new_array[existing]
+        columns[column] = array
+        new_rows[column] = new_array[~existing]
+
+    if existing.all():
+        return pd.DataFrame(columns, copy=False)
+    return insert_rows(columns, new_rows, positions[~existing])
@@ -1,6 +1,26 @@
-import mysql.connector
-from mysql.connector import Error
+import os
+import queue
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
+from metrics import time_stage, count_rows
+from data_processing import SCORE_DECIMALS, histogram_edges
+
+try:
+    import resource
+except ImportError: # Not available on Windows; peak RSS is then not reported
+    resource = None
+
+try:
+    import mysql.connector
+    from mysql.connector import Error as MySQLError
+except ImportError: # The SQLite backend works without the MySQL driver installed
+    mysql = None
+    MySQLError = sqlite3.Error
 
 DB_CONFIG = {
     'host': 'localhost',
@@ -9,25 +29,431 @@ DB_CONFIG = {
     'password': 'Windows@11'  # Replace with your MySQL password
 }
 
-def create_db_connection():
-    """Establishes a connection to the MySQL database."""
-    connection = None
-    try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        if connection.is_connected():
-            print("Database connection successful.")
-    except Error as e:
-        print(f"Error connecting to MySQL: {e}")
-    return connection
-
-def fetch_employee_performance_data():
-    """Fetches combined employee and performance data from the database."""
-    connection = create_db_connection()
-    if connection is None:
-        return pd.DataFrame() # Return empty DataFrame if connection fails
+# Backend used by default: 'mysql', or 'sqlite' for an embedded stand-in (tests, benchmarks)
+DB_BACKEND = os.environ.get('EMPLOYEE_DB_BACKEND', 'mysql')
+SQLITE_PATH = os.environ.get('EMPLOYEE_DB_SQLITE_PATH', 'employee_performance.sqlite3')
+POOL_SIZE = 5 # Maximum number of open connections shared by the app
+POOL_TIMEOUT_SECONDS = 30 # How long to wait for a free connection before giving up
+
+CHUNK_SIZE = 100_000 # Rows per fetchmany() batch in the chunked loader
+
+# Compact dtypes used by the chunked loader; scores are float32 so NULLs survive as NaN.
+# Salaries stay float64: DECIMAL(10, 2) amounts in the 100k range lose their cents in float32
+EMPLOYEE_DTYPES = {
+    'employee_id': 'int32',
+    'department': 'category',
+    'position': 'category',
+    'hire_date': 'datetime64[ns]',
+    'salary': 'float64'
+}
+PERFORMANCE_DTYPES = {
+    'performance_id': 'int32',
+    'employee_id': 'int32',
+    'kpi_score': 'float32',
+    'attendance_score': 'float32',
+    'appraisal_rating': 'float32',
+    'feedback': 'category',
+    'performance_date': 'datetime64[ns]'
+}
+
+# Secondary indexes added by apply_schema_indexes(): per-employee trends and the
+# joined load read performance in (employee_id, performance_date) order, and
+# pushdown queries select employees by department and position
+SCHEMA_INDEXES = {
+    'idx_performance_employee_date': ('performance', 'employee_id, performance_date'),
+    'idx_employees_department_position': ('employees', 'department, position')
+}
+
+# Errors raised by any supported backend
+DatabaseError = (MySQLError, sqlite3.Error, pd.errors.DatabaseError, TimeoutError)
+
+# SQLite equivalent of employee_performance_db.sql
+SQLITE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS employees (
+        employee_id INTEGER PRIMARY KEY,
+        first_name VARCHAR(50) NOT NULL,
+        last_name VARCHAR(50) NOT NULL,
+        department VARCHAR(50),
+        position VARCHAR(50),
+        hire_date DATE,
+        salary DECIMAL(10, 2),
+        email VARCHAR(100) UNIQUE
+    );
+
+    CREATE TABLE IF NOT EXISTS performance (
+        performance_id INTEGER PRIMARY KEY,
+        employee_id INT NOT NULL,
+        kpi_score DECIMAL(5, 2),
+        attendance_score DECIMAL(5, 2),
+        appraisal_rating INT,
+        feedback TEXT,
+        performance_date DATE,
+        FOREIGN KEY (employee_id) REFERENCES employees(employee_id)
+    );
+
+    CREATE TABLE IF NOT EXISTS employee_summary (
+        employee_id INTEGER PRIMARY KEY,
+        num_performance_records INT NOT NULL DEFAULT 0,
+        sum_kpi_score DECIMAL(15, 2) NOT NULL DEFAULT 0,
+        sum_attendance_score DECIMAL(15, 2) NOT NULL DEFAULT 0,
+        sum_appraisal_rating BIGINT NOT NULL DEFAULT 0,
+        count_kpi_score INT NOT NULL DEFAULT 0,
+        count_attendance_score INT NOT NULL DEFAULT 0,
+        count_appraisal_rating INT NOT NULL DEFAULT 0,
+        max_performance_id INT NOT NULL,
+        latest_performance_date DATE,
+        latest_kpi_score DECIMAL(5, 2),
+        latest_attendance_score DECIMAL(5, 2),
+        latest_appraisal_rating INT,
+        FOREIGN KEY (employee_id) REFERENCES employees(employee_id)
+    );
+
+    -- MySQL creates this index implicitly for the foreign key
+    CREATE INDEX IF NOT EXISTS idx_performance_employee ON performance (employee_id);
+    -- See SCHEMA_INDEXES
+    CREATE INDEX IF NOT EXISTS idx_performance_employee_date ON performance (employee_id, performance_date);
+    CREATE INDEX IF NOT EXISTS idx_employees_department_position ON employees (department, position);
+
+    -- Employees without a department or position are keyed by '', since NULLs never conflict
+    CREATE TABLE IF NOT EXISTS department_position_summary (
+        department VARCHAR(50) NOT NULL DEFAULT '',
+        position VARCHAR(50) NOT NULL DEFAULT '',
+        num_employees INT NOT NULL DEFAULT 0,
+        sum_avg_kpi_score DOUBLE NOT NULL DEFAULT 0,
+        sum_avg_attendance_score DOUBLE NOT NULL DEFAULT 0,
+        sum_avg_appraisal_rating DOUBLE NOT NULL DEFAULT 0,
+        count_avg_kpi_score INT NOT NULL DEFAULT 0,
+        count_avg_attendance_score INT NOT NULL DEFAULT 0,
+        count_avg_appraisal_rating INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (department, position)
+    );
+
+    -- Databases created before still have the record-weighted department_summary and its combined trigger
+    DROP TRIGGER IF EXISTS performance_after_insert_summaries;
+    DROP TABLE IF EXISTS department_summary;
+
+    CREATE TRIGGER IF NOT EXISTS performance_after_insert_employee_summary
+    AFTER INSERT ON performance
+    BEGIN
+        INSERT INTO employee_summary (
+            employee_id, num_performance_records,
+            sum_kpi_score, sum_attendance_score, sum_appraisal_rating,
+            count_kpi_score, count_attendance_score, count_appraisal_rating,
+            max_performance_id, latest_performance_date,
+            latest_kpi_score, latest_attendance_score, latest_appraisal_rating
+        ) VALUES (
+            NEW.employee_id, 1,
+            COALESCE(NEW.kpi_score, 0), COALESCE(NEW.attendance_score, 0), COALESCE(NEW.appraisal_rating, 0),
+            NEW.kpi_score IS NOT NULL, NEW.attendance_score IS NOT NULL, NEW.appraisal_rating IS NOT NULL,
+            NEW.performance_id, NEW.performance_date,
+            NEW.kpi_score, NEW.attendance_score, NEW.appraisal_rating
+        )
+        ON CONFLICT (employee_id) DO UPDATE SET
+            num_performance_records = num_performance_records + 1,
+            sum_kpi_score = sum_kpi_score + COALESCE(NEW.kpi_score, 0),
+            sum_attendance_score = sum_attendance_score + COALESCE(NEW.attendance_score, 0),
+            sum_appraisal_rating = sum_appraisal_rating + COALESCE(NEW.appraisal_rating, 0),
+            count_kpi_score = count_kpi_score + (NEW.kpi_score IS NOT NULL),
+            count_attendance_score = count_attendance_score + (NEW.attendance_score IS NOT NULL),
+            count_appraisal_rating = count_appraisal_rating + (NEW.appraisal_rating IS NOT NULL),
+            max_performance_id = MAX(max_performance_id, NEW.performance_id),
+            latest_kpi_score = CASE WHEN latest_performance_date IS NULL OR NEW.performance_date >= latest_performance_date THEN NEW.kpi_score ELSE latest_kpi_score END,
+            latest_attendance_score = CASE WHEN latest_performance_date IS NULL OR NEW.performance_date >= latest_performance_date THEN NEW.attendance_score ELSE latest_attendance_score END,
+            latest_appraisal_rating = CASE WHEN latest_performance_date IS NULL OR NEW.performance_date >= latest_performance_date THEN NEW.appraisal_rating ELSE latest_appraisal_rating END,
+            latest_performance_date = CASE WHEN latest_performance_date IS NULL OR NEW.performance_date >= latest_performance_date THEN NEW.performance_date ELSE latest_performance_date END;
+    END;
+
+    -- Every trigger below adds deltas to department_position_summary: a new employee average,
+    -- the change of an existing one, or an employee's averages moving to another group
+    CREATE TRIGGER IF NOT EXISTS employee_summary_after_insert_department_position_summary
+    AFTER INSERT ON employee_summary
+    BEGIN
+        INSERT INTO department_position_summary (
+            department, position, num_employees,
+            sum_avg_kpi_score, sum_avg_attendance_score, sum_avg_appraisal_rating,
+            count_avg_kpi_score, count_avg_attendance_score, count_avg_appraisal_rating
+        )
+        SELECT
+            COALESCE(department, ''), COALESCE(position, ''), 1,
+            COALESCE(1e0 * NEW.sum_kpi_score / NULLIF(NEW.count_kpi_score, 0), 0),
+            COALESCE(1e0 * NEW.sum_attendance_score / NULLIF(NEW.count_attendance_score, 0), 0),
+            COALESCE(1e0 * NEW.sum_appraisal_rating / NULLIF(NEW.count_appraisal_rating, 0), 0),
+            NEW.count_kpi_score > 0, NEW.count_attendance_score > 0, NEW.count_appraisal_rating > 0
+        FROM employees WHERE employee_id = NEW.employee_id
+        ON CONFLICT (department, position) DO UPDATE SET
+            num_employees = num_employees + excluded.num_employees,
+            sum_avg_kpi_score = sum_avg_kpi_score + excluded.sum_avg_kpi_score,
+            sum_avg_attendance_score = sum_avg_attendance_score + excluded.sum_avg_attendance_score,
+            sum_avg_appraisal_rating = sum_avg_appraisal_rating + excluded.sum_avg_appraisal_rating,
+            count_avg_kpi_score = count_avg_kpi_score + excluded.count_avg_kpi_score,
+            count_avg_attendance_score = count_avg_attendance_score + excluded.count_avg_attendance_score,
+            count_avg_appraisal_rating = count_avg_appraisal_rating + excluded.count_avg_appraisal_rating;
+    END;
+
+    -- The performance trigger's upsert fires this one for employees who already had records
+    CREATE TRIGGER IF NOT EXISTS employee_summary_after_update_department_position_summary
+    AFTER UPDATE ON employee_summary
+    BEGIN
+        INSERT INTO department_position_summary (
+            department, position, num_employees,
+            sum_avg_kpi_score, sum_avg_attendance_score, sum_avg_appraisal_rating,
+            count_avg_kpi_score, count_avg_attendance_score, count_avg_appraisal_rating
+        )
+        SELECT
+            COALESCE(department, ''), COALESCE(position, ''), 0,
+            COALESCE(1e0 * NEW.sum_kpi_score / NULLIF(NEW.count_kpi_score, 0), 0) - COALESCE(1e0 * OLD.sum_kpi_score / NULLIF(OLD.count_kpi_score, 0), 0),
+            COALESCE(1e0 * NEW.sum_attendance_score / NULLIF(NEW.count_attendance_score, 0), 0) - COALESCE(1e0 * OLD.sum_attendance_score / NULLIF(OLD.count_attendance_score, 0), 0),
+            COALESCE(1e0 * NEW.sum_appraisal_rating / NULLIF(NEW.count_appraisal_rating, 0), 0) - COALESCE(1e0 * OLD.sum_appraisal_rating / NULLIF(OLD.count_appraisal_rating, 0), 0),
+            (NEW.count_kpi_score > 0) - (OLD.count_kpi_score > 0),
+            (NEW.count_attendance_score > 0) - (OLD.count_attendance_score > 0),
+            (NEW.count_appraisal_rating > 0) - (OLD.count_appraisal_rating > 0)
+        FROM employees WHERE employee_id = NEW.employee_id
+        ON CONFLICT (department, position) DO UPDATE SET
+            num_employees = num_employees + excluded.num_employees,
+            sum_avg_kpi_score = sum_avg_kpi_score + excluded.sum_avg_kpi_score,
+            sum_avg_attendance_score = sum_avg_attendance_score + excluded.sum_avg_attendance_score,
+            sum_avg_appraisal_rating = sum_avg_appraisal_rating + excluded.sum_avg_appraisal_rating,
+            count_avg_kpi_score = count_avg_kpi_score + excluded.count_avg_kpi_score,
+            count_avg_attendance_score = count_avg_attendance_score + excluded.count_avg_attendance_score,
+            count_avg_appraisal_rating = count_avg_appraisal_rating + excluded.count_avg_appraisal_rating;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS employees_after_update_department_position_summary
+    AFTER UPDATE OF department, position ON employees
+    WHEN OLD.department IS NOT NEW.department OR OLD.position IS NOT NEW.position
+    BEGIN
+        INSERT INTO department_position_summary (
+            department, position, num_employees,
+            sum_avg_kpi_score, sum_avg_attendance_score, sum_avg_appraisal_rating,
+            count_avg_kpi_score, count_avg_attendance_score, count_avg_appraisal_rating
+        )
+        SELECT
+            COALESCE(OLD.department, ''), COALESCE(OLD.position, ''), -1,
+            -COALESCE(1e0 * sum_kpi_score / NULLIF(count_kpi_score, 0), 0),
+            -COALESCE(1e0 * sum_attendance_score / NULLIF(count_attendance_score, 0), 0),
+            -COALESCE(1e0 * sum_appraisal_rating / NULLIF(count_appraisal_rating, 0), 0),
+            -(count_kpi_score > 0), -(count_attendance_score > 0), -(count_appraisal_rating > 0)
+        FROM employee_summary WHERE employee_id = OLD.employee_id
+        UNION ALL
+        SELECT
+            COALESCE(NEW.department, ''), COALESCE(NEW.position, ''), 1,
+            COALESCE(1e0 * sum_kpi_score / NULLIF(count_kpi_score, 0), 0),
+            COALESCE(1e0 * sum_attendance_score / NULLIF(count_attendance_score, 0), 0),
+            COALESCE(1e0 * sum_appraisal_rating / NULLIF(count_appraisal_rating, 0), 0),
+            count_kpi_score > 0, count_attendance_score > 0, count_appraisal_rating > 0
+        FROM employee_summary WHERE employee_id = NEW.employee_id
+        ON CONFLICT (department, position) DO UPDATE SET
+            num_employees = num_employees + excluded.num_employees,
+            sum_avg_kpi_score = sum_avg_kpi_score + excluded.sum_avg_kpi_score,
+            sum_avg_attendance_score = sum_avg_attendance_score + excluded.sum_avg_attendance_score,
+            sum_avg_appraisal_rating = sum_avg_appraisal_rating + excluded.sum_avg_appraisal_rating,
+            count_avg_kpi_score = count_avg_kpi_score + excluded.count_avg_kpi_score,
+            count_avg_attendance_score = count_avg_attendance_score + excluded.count_avg_attendance_score,
+            count_avg_appraisal_rating = count_avg_appraisal_rating + excluded.count_avg_appraisal_rating;
+    END;
+
+    -- Fill the table once on databases that had summaries before it existed
+    INSERT INTO department_position_summary (
+        department, position, num_employees,
+        sum_avg_kpi_score, sum_avg_attendance_score, sum_avg_appraisal_rating,
+        count_avg_kpi_score, count_avg_attendance_score, count_avg_appraisal_rating
+    )
+    SELECT
+        COALESCE(e.department, ''), COALESCE(e.position, ''), COUNT(*),
+        COALESCE(SUM(1e0 * s.sum_kpi_score / NULLIF(s.count_kpi_score, 0)), 0),
+        COALESCE(SUM(1e0 * s.sum_attendance_score / NULLIF(s.count_attendance_score, 0)), 0),
+        COALESCE(SUM(1e0 * s.sum_appraisal_rating / NULLIF(s.count_appraisal_rating, 0)), 0),
+        COUNT(NULLIF(s.count_kpi_score, 0)), COUNT(NULLIF(s.count_attendance_score, 0)), COUNT(NULLIF(s.count_appraisal_rating, 0))
+    FROM employee_summary s
+    JOIN employees e ON e.employee_id = s.employee_id
+    WHERE NOT EXISTS (SELECT 1 FROM department_position_summary)
+    GROUP BY COALESCE(e.department, ''), COALESCE(e.position, '');
+"""
+
+class MySQLBackend:
+    """Connections to the MySQL server described by DB_CONFIG."""
+    name = 'mysql'
+
+    def __init__(self, config=None):
+        if mysql is None:
+            raise ImportError("mysql-connector-python is required for the MySQL backend.")
+        self.config = config or DB_CONFIG
+
+    def connect(self):
+        return mysql.connector.connect(**self.config)
+
+    def is_healthy(self, connection):
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except MySQLError:
+            return False
+
+    def format_query(self, sql):
+        return sql
+
+    def index_names(self, cursor, table):
+        cursor.execute(
+            "SELECT DISTINCT index_name FROM information_schema.statistics WHERE table_schema = DATABASE() AND table_name = %s",
+            (table,)
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+    def clear_tables_statements(self):
+        # Delete from 'performance' first due to foreign key constraint
+        return [
+            "SET FOREIGN_KEY_CHECKS = 0;", # Temporarily disable FK checks
+            "TRUNCATE TABLE performance", # TRUNCATE is faster for full table clear
+            "TRUNCATE TABLE employee_summary", # Triggers do not fire on TRUNCATE, so clear the summaries too
+            "TRUNCATE TABLE department_position_summary",
+            "TRUNCATE TABLE employees",
+            "SET FOREIGN_KEY_CHECKS = 1;" # Re-enable FK checks
+        ]
+
+class SQLiteBackend:
+    """Embedded SQLite stand-in with the same schema, for running without a MySQL server."""
+    name = 'sqlite'
+
+    def __init__(self, path=None):
+        self.path = path or SQLITE_PATH
+        self._schema_ready = False
+
+    def connect(self):
+        # Pooled connections are handed between threads, one at a time
+        connection = sqlite3.connect(self.path, check_same_thread=False, uri=self.path.startswith('file:'))
+        if not self._schema_ready:
+            connection.executescript(SQLITE_SCHEMA)
+            self._schema_ready = True
+        return connection
+
+    def is_healthy(self, connection):
+        try:
+            connection.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def format_query(self, sql):
+        # sqlite3 uses qmark placeholders instead of MySQL's %s
+        return sql.replace('%s', '?')
+
+    def index_names(self, cursor, table):
+        cursor.execute(f"PRAGMA index_list({table})")
+        return {row[1] for row in cursor.fetchall()}
+
+    def clear_tables_statements(self):
+        return [
+            "DELETE FROM performance",
+            "DELETE FROM employee_summary",
+            "DELETE FROM department_position_summary",
+            "DELETE FROM employees"
+        ]
+
+BACKENDS = {'mysql': MySQLBackend, 'sqlite': SQLiteBackend}
+
+class ConnectionPool:
+    """A size-bounded pool of reusable connections for one backend.
+
+    Idle connections are health-checked before being handed out again and
+    replaced when the check fails; at most max_size connections exist at once.
+    Every release rolls back, so a reused connection starts a fresh transaction.
+    """
+
+    def __init__(self, backend, max_size=POOL_SIZE, timeout=POOL_TIMEOUT_SECONDS):
+        self.backend = backend
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def acquire(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"No database connection became free within {self.timeout}s.")
+
+        try:
+            while True:
+                try:
+                    connection = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                if self.backend.is_healthy(connection):
+                    return connection
+                self._close(connection)
+            return self.backend.connect()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, connection):
+        # End the borrower's transaction: MySQL connections are not autocommit, and a
+        # REPEATABLE READ snapshot left open would keep the next borrower from seeing
+        # newer rows. Writers commit before releasing; anything uncommitted is discarded.
+        try:
+            connection.rollback()
+        except Exception:
+            self._close(connection)
+        else:
+            self._idle.put(connection)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Borrows a connection for the duration of a with-block."""
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close_all(self):
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def _close(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Returns the shared connection pool, creating it for DB_BACKEND on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(BACKENDS[DB_BACKEND]())
+        return _pool
+
+def configure_backend(backend, pool_size=POOL_SIZE):
+    """Replaces the shared pool with one for the given backend (e.g. SQLiteBackend(path))."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+        _pool = ConnectionPool(backend, max_size=pool_size)
+        return _pool
+
+def fetch_employee_performance_data(since_performance_id=None):
+    """Fetches combined employee and performance data from the database.
 
+    If since_performance_id is given, only performance rows with a larger
+    performance_id are returned (used for incremental refreshes).
+    """
+    pool = get_pool()
     try:
-        query = """
+        where_clause = ""
+        params = None
+        if since_performance_id is not None:
+            where_clause = "WHERE p.performance_id > %s"
+            params = (int(since_performance_id),)
+
+        query = f"""
             SELECT
                 e.employee_id,
                 e.first_name,
@@ -36,6 +462,7 @@ def fetch_employee_performance_data():
                 e.position,
                 e.hire_date,
                 e.salary,
+                e.email,
                 p.performance_id, -- <--- ADD THIS LINE
                 p.kpi_score,
                 p.attendance_score,
@@ -46,23 +473,324 @@ def fetch_employee_performance_data():
                 employees e
             JOIN
                 performance p ON e.employee_id = p.employee_id
+            {where_clause}
             ORDER BY
-                e.employee_id, p.performance_date DESC;
+                e.employee_id, p.performance_date DESC, p.performance_id DESC;
         """
-        df = pd.read_sql(query, connection)
-        print("Data fetched successfully.")
+        with pool.connection() as connection, time_stage('sql_query', query='performance'):
+            df = pd.read_sql(pool.backend.format_query(query), connection, params=params)
+        count_rows('performance', len(df))
         return df
-    except Error as e:
+    except DatabaseError as e:
         print(f"Error fetching data: {e}")
         return pd.DataFrame()
-    finally:
-        if connection.is_connected():
-            connection.close()
-            print("Database connection closed.")
+
+def fetch_employee_summary(since_performance_id=None):
+    """Fetches the per-employee summary maintained by the database triggers.
+
+    One row per employee with attributes, running totals and latest values, so
+    the cost depends on headcount rather than on the number of performance
+    records. If since_performance_id is given, only employees with newer
+    records are returned.
+    """
+    pool = get_pool()
+    where_clause = ""
+    params = None
+    if since_performance_id is not None:
+        where_clause = "WHERE s.max_performance_id > %s"
+        params = (int(since_performance_id),)
+
+    query = f"""
+        SELECT
+            e.employee_id, e.first_name, e.last_name, e.department, e.position, e.hire_date, e.salary, e.email,
+            s.latest_kpi_score, s.latest_attendance_score, s.latest_appraisal_rating, s.latest_performance_date,
+            s.sum_kpi_score, s.sum_attendance_score, s.sum_appraisal_rating,
+            s.count_kpi_score, s.count_attendance_score, s.count_appraisal_rating,
+            s.num_performance_records, s.max_performance_id
+        FROM
+            employee_summary s
+        JOIN
+            employees e ON e.employee_id = s.employee_id
+        {where_clause}
+        ORDER BY
+            e.employee_id;
+    """
+    try:
+        with pool.connection() as connection, time_stage('sql_query', query='employee_summary'):
+            df = pd.read_sql(pool.backend.format_query(query), connection, params=params)
+        count_rows('employee_summary', len(df))
+        return df
+    except DatabaseError as e:
+        print(f"Error fetching employee summary: {e}")
+        return pd.DataFrame()
+
+def fetch_department_position_summary():
+    """Fetches the per-(department, position) sums and counts of employee averages kept by the database triggers.
+
+    Columns are named like SummaryFilterIndex partials; the '' keys of
+    employees without a department or position come back as NULL.
+    """
+    pool = get_pool()
+    query = """
+        SELECT
+            NULLIF(department, '') AS department, NULLIF(position, '') AS position,
+            sum_avg_kpi_score, sum_avg_attendance_score, sum_avg_appraisal_rating,
+            count_avg_kpi_score, count_avg_attendance_score, count_avg_appraisal_rating,
+            num_employees
+        FROM department_position_summary
+        WHERE num_employees > 0
+        ORDER BY department, position;
+    """
+    try:
+        with pool.connection() as connection, time_stage('sql_query', query='department_position_summary'):
+            df = pd.read_sql(query, connection)
+        count_rows('department_position_summary', len(df))
+        return df
+    except DatabaseError as e:
+        print(f"Error fetching department summary: {e}")
+        return pd.DataFrame()
+
+def fetch_employee_performance_history(employee_id):
+    """Fetches one employee's performance records, oldest first (same-date records in insertion order)."""
+    pool = get_pool()
+    query = """
+        SELECT performance_id, employee_id, kpi_score, attendance_score, appraisal_rating, feedback, performance_date
+        FROM performance
+        WHERE employee_id = %s
+        ORDER BY performance_date, performance_id;
+    """
+    try:
+        with pool.connection() as connection, time_stage('sql_query', query='performance_history'):
+            df = pd.read_sql(pool.backend.format_query(query), connection, params=(int(employee_id),))
+        count_rows('performance_history', len(df))
+        return df
+    except DatabaseError as e:
+        print(f"Error fetching performance history: {e}")
+        return pd.DataFrame()
+
+def fetch_source_fingerprint():
+    """Returns row counts and max ids of the source tables, or None if the database is unreachable.
+
+    Used to tell whether a saved snapshot still matches the database.
+    """
+    pool = get_pool()
+    try:
+        with pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT COUNT(*), MAX(employee_id) FROM employees")
+                employees_count, max_employee_id = cursor.fetchone()
+                cursor.execute("SELECT COUNT(*), MAX(performance_id) FROM performance")
+                performance_count, max_performance_id = cursor.fetchone()
+            finally:
+                cursor.close()
+    except DatabaseError as e:
+        print(f"Error fetching source fingerprint: {e}")
+        return None
+
+    return {
+        'employees_count': employees_count,
+        'max_employee_id': max_employee_id,
+        'performance_count': performance_count,
+        'max_performance_id': max_performance_id
+    }
+
+def apply_schema_indexes():
+    """Creates the SCHEMA_INDEXES missing from the database; safe to run repeatedly.
+
+    Returns the names of the indexes created, or None if the database is unreachable.
+    """
+    pool = get_pool()
+    created = []
+    try:
+        with pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                for name, (table, columns) in SCHEMA_INDEXES.items():
+                    if name in pool.backend.index_names(cursor, table):
+                        continue
+                    cursor.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+                    created.append(name)
+                connection.commit()
+            finally:
+                cursor.close()
+    except DatabaseError as e:
+        print(f"Error creating indexes: {e}")
+        return None
+    return created
+
+# --- Pushdown queries: the database aggregates per request, nothing but the result is transferred ---
+# Per-employee averages from the trigger-maintained running totals. 1e0 * makes the division a
+# double one: SQLite would divide integers, and MySQL would truncate a DECIMAL quotient to a few digits
+AVERAGE_EXPRESSIONS = {
+    metric: f"1e0 * s.sum_{metric} / NULLIF(s.count_{metric}, 0)"
+    for metric in ['kpi_score', 'attendance_score', 'appraisal_rating']
+}
+
+def _score_key(expression):
+    # SQL counterpart of data_processing.score_keys
+    return f"ROUND({expression} * {10 ** SCORE_DECIMALS})"
+
+def _selection_clause(departments, positions):
+    """Returns the FROM/WHERE clause selecting the summaries of the chosen departments and positions, and its parameters."""
+    clause = "FROM employee_summary s JOIN employees e ON e.employee_id = s.employee_id WHERE 1 = 1"
+    params = []
+    for column, values in (('e.department', departments), ('e.position', positions)):
+        if values:
+            clause += f" AND {column} IN ({', '.join(['%s'] * len(values))})"
+            params.extend(values)
+    return clause, params
+
+def fetch_dashboard_aggregates(departments, positions, top_n=10, histogram_bins=10):
+    """Computes everything update_dashboard draws for a selection with aggregate queries.
+
+    Returns a dict with the number of employees, the overall averages, the
+    per-department KPI averages, the top and bottom top_n employees by average
+    KPI, the latest appraisal rating counts and the attendance histogram as
+    (counts, edges) like np.histogram. Returns None on database errors.
+    The queries only touch the selected employees' rows, through the
+    employees (department, position) index and the employee_summary key.
+    """
+    pool = get_pool()
+    where, params = _selection_clause(departments, positions)
+    kpi, attendance, appraisal = AVERAGE_EXPRESSIONS.values()
+
+    def read(connection, sql, query_params):
+        df = pd.read_sql(pool.backend.format_query(sql), connection, params=tuple(query_params))
+        count_rows('dashboard_pushdown', len(df))
+        return df
+
+    try:
+        with pool.connection() as connection, time_stage('sql_query', query='dashboard_pushdown'):
+            totals = read(connection, f"""
+                SELECT COUNT(*) AS employees, AVG({kpi}) AS avg_kpi_score, AVG({attendance}) AS avg_attendance_score,
+                    AVG({appraisal}) AS avg_appraisal_rating,
+                    MIN({_score_key(attendance)}) AS min_attendance_key, MAX({_score_key(attendance)}) AS max_attendance_key
+                {where}
+            """, params).iloc[0]
+            result = {'employees': int(totals['employees'])}
+            if result['employees'] == 0:
+                return result
+            result['averages'] = [float(totals[column]) for column in ['avg_kpi_score', 'avg_attendance_score', 'avg_appraisal_rating']]
+
+            result['department_averages'] = read(connection, f"""
+                SELECT e.department, AVG({kpi}) AS avg_kpi_score
+                {where} AND e.department IS NOT NULL
+                GROUP BY e.department
+                ORDER BY e.department
+            """, params).astype({'avg_kpi_score': float})
+
+            # Same order as rank_performers: score keys, ties in employee_id order like nlargest/nsmallest
+            for key, direction in (('top', 'DESC'), ('bottom', 'ASC')):
+                ranked = read(connection, f"""
+                    SELECT e.employee_id, e.first_name, e.last_name, {kpi} AS avg_kpi_score
+                    {where} AND s.count_kpi_score > 0
+                    ORDER BY {_score_key(kpi)} {direction}, e.employee_id
+                    LIMIT %s
+                """, params + [int(top_n)]).astype({'avg_kpi_score': float})
+                ranked['full_name'] = ranked['first_name'] + ' ' + ranked['last_name']
+                result[key] = ranked
+
+            ratings = read(connection, f"""
+                SELECT s.latest_appraisal_rating AS rating, COUNT(*) AS employees
+                {where} AND s.latest_appraisal_rating IS NOT NULL
+                GROUP BY s.latest_appraisal_rating
+                ORDER BY s.latest_appraisal_rating
+            """, params)
+            result['appraisal_counts'] = pd.Series(ratings['employees'].to_numpy(), index=ratings['rating'].astype(int).to_numpy())
+
+            # Same bins as data_processing.score_histogram: integral score-key edges, half-open except the last
+            low, high = (np.nan if pd.isna(totals[key]) else float(totals[key]) for key in ('min_attendance_key', 'max_attendance_key'))
+            edges = histogram_edges(low, high, histogram_bins)
+            value = _score_key(attendance)
+            bins = [f"SUM(CASE WHEN {value} >= %s AND {value} < %s THEN 1 ELSE 0 END)" for _ in range(histogram_bins - 1)]
+            bins.append(f"SUM(CASE WHEN {value} >= %s AND {value} <= %s THEN 1 ELSE 0 END)")
+            bin_params = [float(edge) for pair in zip(edges[:-1], edges[1:]) for edge in pair]
+            counts = read(connection, f"SELECT {', '.join(bins)} {where}", bin_params + params).iloc[0]
+            result['attendance_histogram'] = (counts.fillna(0).astype(int).to_numpy(), edges / 10 ** SCORE_DECIMALS)
+            return result
+    except DatabaseError as e:
+        print(f"Error fetching dashboard aggregates: {e}")
+        return None
+
+def peak_rss_mb():
+    """Returns the peak resident set size of this process in MB, or None if unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def compact_frame(df, dtypes):
+    """Casts the columns of df that appear in dtypes to their compact types."""
+    for column, dtype in dtypes.items():
+        if column not in df:
+            continue
+        if dtype.startswith('datetime64'):
+            df[column] = pd.to_datetime(df[column])
+        elif dtype.startswith('float'):
+            df[column] = pd.to_numeric(df[column]).astype(dtype) # DECIMAL columns arrive as Decimal objects
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
+
+def concat_compact_frames(frames):
+    """Concatenates compact frames, merging categorical categories instead of falling back to object."""
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+
+    categorical = [column for column in frames[0] if isinstance(frames[0][column].dtype, pd.CategoricalDtype)]
+    df = pd.concat([frame.drop(columns=categorical) for frame in frames], ignore_index=True)
+    for column in categorical:
+        df[column] = union_categoricals([frame[column] for frame in frames])
+    return df[frames[0].columns]
+
+def fetch_employee_performance_data_chunked(chunksize=CHUNK_SIZE):
+    """Streams employee and performance data in compact, chunked form.
+
+    Employee attributes are fetched once per employee instead of being
+    repeated on every performance row. Performance rows are read with
+    fetchmany() (MySQL connector cursors are unbuffered, so rows stream from
+    the server) and each chunk is cast to compact dtypes before the next one
+    is read. Returns (employees, performance); both are empty on error.
+    """
+    pool = get_pool()
+    employees_query = """
+        SELECT employee_id, first_name, last_name, department, position, hire_date, salary, email
+        FROM employees
+        ORDER BY employee_id;
+    """
+    performance_query = """
+        SELECT performance_id, employee_id, kpi_score, attendance_score, appraisal_rating, feedback, performance_date
+        FROM performance
+        ORDER BY employee_id, performance_date DESC, performance_id DESC;
+    """
+    try:
+        with pool.connection() as connection, time_stage('sql_query', query='performance_chunked'):
+            employees = compact_frame(pd.read_sql(employees_query, connection), EMPLOYEE_DTYPES)
+
+            chunks = [
+                compact_frame(chunk, PERFORMANCE_DTYPES)
+                for chunk in pd.read_sql(performance_query, connection, chunksize=chunksize)
+            ]
+        performance = concat_compact_frames(chunks)
+    except DatabaseError as e:
+        print(f"Error fetching data: {e}")
+        return pd.DataFrame(), pd.DataFrame()
+    count_rows('employees', len(employees))
+    count_rows('performance', len(performance))
+
+    peak = peak_rss_mb()
+    print(f"Fetched {len(performance)} performance records in {len(chunks)} chunks"
+          + (f" (peak RSS {peak:.1f} MB)." if peak is not None else "."))
+    return employees, performance
 
 if __name__ == "__main__":
     # Example usage:
     df_performance = fetch_employee_performance_data()
     print("\nSample Data from Database:")
     print(df_performance.head())
-    print(f"\nTotal records fetched: {len(df_performance)}")
\ No newline at end of file
+    print(f"\nTotal records fetched: {len(df_performance)}")
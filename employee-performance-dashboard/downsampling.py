@@ -0,0 +1,38 @@
+import numpy as np
+
+def lttb_indices(x, y, threshold):
+    """Picks at most threshold points of a series with Largest-Triangle-Three-Buckets.
+
+    x and y are numeric arrays of equal length without NaNs, x sorted. The
+    first and last points are always kept; in between, each bucket keeps the
+    point forming the largest triangle with the previously kept point and the
+    average of the next bucket, which preserves peaks and dips of the trend.
+    Returns the selected positions.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    every = (n - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    previous = 0
+
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, n)
+        average_x = x[end:next_end].mean() if next_end > end else x[-1]
+        average_y = y[end:next_end].mean() if next_end > end else y[-1]
+
+        areas = np.abs(
+            (x[previous] - average_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (average_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+
+    selected[-1] = n - 1
+    return selected
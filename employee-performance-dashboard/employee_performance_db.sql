@@ -13,7 +13,9 @@ CREATE TABLE IF NOT EXISTS employees (
     position VARCHAR(50),
     hire_date DATE,
     salary DECIMAL(10, 2),
-    email VARCHAR(100) UNIQUE
+    email VARCHAR(100) UNIQUE,
+    -- Pushdown queries select employees by department and position
+    INDEX idx_employees_department_position (department, position)
 );
 
 -- Create the performance table
@@ -25,5 +27,227 @@ CREATE TABLE IF NOT EXISTS performance (
     appraisal_rating INT,
     feedback TEXT,
     performance_date DATE,
+    FOREIGN KEY (employee_id) REFERENCES employees(employee_id),
+    -- Per-employee trends and the joined load read records in this order
+    INDEX idx_performance_employee_date (employee_id, performance_date)
+);
+
+-- Existing databases get these indexes from migrate_schema.py
+
+-- Per-employee running totals and latest record, maintained by the trigger below
+-- so the dashboard can load summaries without scanning the performance table
+CREATE TABLE IF NOT EXISTS employee_summary (
+    employee_id INT PRIMARY KEY,
+    num_performance_records INT NOT NULL DEFAULT 0,
+    sum_kpi_score DECIMAL(15, 2) NOT NULL DEFAULT 0,
+    sum_attendance_score DECIMAL(15, 2) NOT NULL DEFAULT 0,
+    sum_appraisal_rating BIGINT NOT NULL DEFAULT 0,
+    count_kpi_score INT NOT NULL DEFAULT 0,
+    count_attendance_score INT NOT NULL DEFAULT 0,
+    count_appraisal_rating INT NOT NULL DEFAULT 0,
+    max_performance_id INT NOT NULL,
+    latest_performance_date DATE,
+    latest_kpi_score DECIMAL(5, 2),
+    latest_attendance_score DECIMAL(5, 2),
+    latest_appraisal_rating INT,
     FOREIGN KEY (employee_id) REFERENCES employees(employee_id)
-);
\ No newline at end of file
+);
+
+-- Per-(department, position) sums and counts of the employee averages, maintained by the
+-- triggers below so the dashboard's overall and department bars need no scan at all.
+-- Employees without a department or position are keyed by '', since NULLs never conflict
+CREATE TABLE IF NOT EXISTS department_position_summary (
+    department VARCHAR(50) NOT NULL DEFAULT '',
+    position VARCHAR(50) NOT NULL DEFAULT '',
+    num_employees INT NOT NULL DEFAULT 0,
+    sum_avg_kpi_score DOUBLE NOT NULL DEFAULT 0,
+    sum_avg_attendance_score DOUBLE NOT NULL DEFAULT 0,
+    sum_avg_appraisal_rating DOUBLE NOT NULL DEFAULT 0,
+    count_avg_kpi_score INT NOT NULL DEFAULT 0,
+    count_avg_attendance_score INT NOT NULL DEFAULT 0,
+    count_avg_appraisal_rating INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (department, position)
+);
+
+-- The record-weighted department_summary of earlier versions did not match the dashboard's
+-- per-employee means and was never read; drop it from databases created before
+DROP TRIGGER IF EXISTS performance_after_insert_department_summary;
+DROP TABLE IF EXISTS department_summary;
+
+-- Keep the employee summary current as performance rows are inserted.
+-- The latest_* columns are assigned before latest_performance_date because
+-- MySQL evaluates ON DUPLICATE KEY UPDATE assignments left to right.
+DROP TRIGGER IF EXISTS performance_after_insert_employee_summary;
+CREATE TRIGGER performance_after_insert_employee_summary
+AFTER INSERT ON performance
+FOR EACH ROW
+    INSERT INTO employee_summary (
+        employee_id, num_performance_records,
+        sum_kpi_score, sum_attendance_score, sum_appraisal_rating,
+        count_kpi_score, count_attendance_score, count_appraisal_rating,
+        max_performance_id, latest_performance_date,
+        latest_kpi_score, latest_attendance_score, latest_appraisal_rating
+    ) VALUES (
+        NEW.employee_id, 1,
+        COALESCE(NEW.kpi_score, 0), COALESCE(NEW.attendance_score, 0), COALESCE(NEW.appraisal_rating, 0),
+        NEW.kpi_score IS NOT NULL, NEW.attendance_score IS NOT NULL, NEW.appraisal_rating IS NOT NULL,
+        NEW.performance_id, NEW.performance_date,
+        NEW.kpi_score, NEW.attendance_score, NEW.appraisal_rating
+    )
+    ON DUPLICATE KEY UPDATE
+        num_performance_records = num_performance_records + 1,
+        sum_kpi_score = sum_kpi_score + COALESCE(NEW.kpi_score, 0),
+        sum_attendance_score = sum_attendance_score + COALESCE(NEW.attendance_score, 0),
+        sum_appraisal_rating = sum_appraisal_rating + COALESCE(NEW.appraisal_rating, 0),
+        count_kpi_score = count_kpi_score + (NEW.kpi_score IS NOT NULL),
+        count_attendance_score = count_attendance_score + (NEW.attendance_score IS NOT NULL),
+        count_appraisal_rating = count_appraisal_rating + (NEW.appraisal_rating IS NOT NULL),
+        max_performance_id = GREATEST(max_performance_id, NEW.performance_id),
+        latest_kpi_score = IF(latest_performance_date IS NULL OR NEW.performance_date >= latest_performance_date, NEW.kpi_score, latest_kpi_score),
+        latest_attendance_score = IF(latest_performance_date IS NULL OR NEW.performance_date >= latest_performance_date, NEW.attendance_score, latest_attendance_score),
+        latest_appraisal_rating = IF(latest_performance_date IS NULL OR NEW.performance_date >= latest_performance_date, NEW.appraisal_rating, latest_appraisal_rating),
+        latest_performance_date = IF(latest_performance_date IS NULL OR NEW.performance_date >= latest_performance_date, NEW.performance_date, latest_performance_date);
+
+-- Every trigger below adds deltas to department_position_summary: a new employee average,
+-- the change of an existing one, or an employee's averages moving to another group.
+-- The performance trigger's upsert fires the insert trigger for new employees and the update trigger otherwise
+DROP TRIGGER IF EXISTS employee_summary_after_insert_department_position_summary;
+CREATE TRIGGER employee_summary_after_insert_department_position_summary
+AFTER INSERT ON employee_summary
+FOR EACH ROW
+    INSERT INTO department_position_summary (
+        department, position, num_employees,
+        sum_avg_kpi_score, sum_avg_attendance_score, sum_avg_appraisal_rating,
+        count_avg_kpi_score, count_avg_attendance_score, count_avg_appraisal_rating
+    )
+    SELECT
+        COALESCE(department, ''), COALESCE(position, ''), 1,
+        COALESCE(1e0 * NEW.sum_kpi_score / NULLIF(NEW.count_kpi_score, 0), 0),
+        COALESCE(1e0 * NEW.sum_attendance_score / NULLIF(NEW.count_attendance_score, 0), 0),
+        COALESCE(1e0 * NEW.sum_appraisal_rating / NULLIF(NEW.count_appraisal_rating, 0), 0),
+        NEW.count_kpi_score > 0, NEW.count_attendance_score > 0, NEW.count_appraisal_rating > 0
+    FROM employees WHERE employee_id = NEW.employee_id
+    ON DUPLICATE KEY UPDATE
+        num_employees = num_employees + VALUES(num_employees),
+        sum_avg_kpi_score = sum_avg_kpi_score + VALUES(sum_avg_kpi_score),
+        sum_avg_attendance_score = sum_avg_attendance_score + VALUES(sum_avg_attendance_score),
+        sum_avg_appraisal_rating = sum_avg_appraisal_rating + VALUES(sum_avg_appraisal_rating),
+        count_avg_kpi_score = count_avg_kpi_score + VALUES(count_avg_kpi_score),
+        count_avg_attendance_score = count_avg_attendance_score + VALUES(count_avg_attendance_score),
+        count_avg_appraisal_rating = count_avg_appraisal_rating + VALUES(count_avg_appraisal_rating);
+
+DROP TRIGGER IF EXISTS employee_summary_after_update_department_position_summary;
+CREATE TRIGGER employee_summary_after_update_department_position_summary
+AFTER UPDATE ON employee_summary
+FOR EACH ROW
+    INSERT INTO department_position_summary (
+        department, position, num_employees,
+        sum_avg_kpi_score, sum_avg_attendance_score, sum_avg_appraisal_rating,
+        count_avg_kpi_score, count_avg_attendance_score, count_avg_appraisal_rating
+    )
+    SELECT
+        COALESCE(department, ''), COALESCE(position, ''), 0,
+        COALESCE(1e0 * NEW.sum_kpi_score / NULLIF(NEW.count_kpi_score, 0), 0) - COALESCE(1e0 * OLD.sum_kpi_score / NULLIF(OLD.count_kpi_score, 0), 0),
+        COALESCE(1e0 * NEW.sum_attendance_score / NULLIF(NEW.count_attendance_score, 0), 0) - COALESCE(1e0 * OLD.sum_attendance_score / NULLIF(OLD.count_attendance_score, 0), 0),
+        COALESCE(1e0 * NEW.sum_appraisal_rating / NULLIF(NEW.count_appraisal_rating, 0), 0) - COALESCE(1e0 * OLD.sum_appraisal_rating / NULLIF(OLD.count_appraisal_rating, 0), 0),
+        (NEW.count_kpi_score > 0) - (OLD.count_kpi_score > 0),
+        (NEW.count_attendance_score > 0) - (OLD.count_attendance_score > 0),
+        (NEW.count_appraisal_rating > 0) - (OLD.count_appraisal_rating > 0)
+    FROM employees WHERE employee_id = NEW.employee_id
+    ON DUPLICATE KEY UPDATE
+        num_employees = num_employees + VALUES(num_employees),
+        sum_avg_kpi_score = sum_avg_kpi_score + VALUES(sum_avg_kpi_score),
+        sum_avg_attendance_score = sum_avg_attendance_score + VALUES(sum_avg_attendance_score),
+        sum_avg_appraisal_rating = sum_avg_appraisal_rating + VALUES(sum_avg_appraisal_rating),
+        count_avg_kpi_score = count_avg_kpi_score + VALUES(count_avg_kpi_score),
+        count_avg_attendance_score = count_avg_attendance_score + VALUES(count_avg_attendance_score),
+        count_avg_appraisal_rating = count_avg_appraisal_rating + VALUES(count_avg_appraisal_rating);
+
+-- An employee moving to another department or position takes their averages along
+DROP TRIGGER IF EXISTS employees_after_update_department_position_summary;
+CREATE TRIGGER employees_after_update_department_position_summary
+AFTER UPDATE ON employees
+FOR EACH ROW
+    INSERT INTO department_position_summary (
+        department, position, num_employees,
+        sum_avg_kpi_score, sum_avg_attendance_score, sum_avg_appraisal_rating,
+        count_avg_kpi_score, count_avg_attendance_score, count_avg_appraisal_rating
+    )
+    SELECT
+        COALESCE(OLD.department, ''), COALESCE(OLD.position, ''), -1,
+        -COALESCE(1e0 * sum_kpi_score / NULLIF(count_kpi_score, 0), 0),
+        -COALESCE(1e0 * sum_attendance_score / NULLIF(count_attendance_score, 0), 0),
+        -COALESCE(1e0 * sum_appraisal_rating / NULLIF(count_appraisal_rating, 0), 0),
+        -(count_kpi_score > 0), -(count_attendance_score > 0), -(count_appraisal_rating > 0)
+    FROM employee_summary
+    WHERE employee_id = OLD.employee_id AND NOT (OLD.department <=> NEW.department AND OLD.position <=> NEW.position)
+    UNION ALL
+    SELECT
+        COALESCE(NEW.department, ''), COALESCE(NEW.position, ''), 1,
+        COALESCE(1e0 * sum_kpi_score / NULLIF(count_kpi_score, 0), 0),
+        COALESCE(1e0 * sum_attendance_score / NULLIF(count_attendance_score, 0), 0),
+        COALESCE(1e0 * sum_appraisal_rating / NULLIF(count_appraisal_rating, 0), 0),
+        count_kpi_score > 0, count_attendance_score > 0, count_appraisal_rating > 0
+    FROM employee_summary
+    WHERE employee_id = NEW.employee_id AND NOT (OLD.department <=> NEW.department AND OLD.position <=> NEW.position)
+    ON DUPLICATE KEY UPDATE
+        num_employees = num_employees + VALUES(num_employees),
+        sum_avg_kpi_score = sum_avg_kpi_score + VALUES(sum_avg_kpi_score),
+        sum_avg_attendance_score = sum_avg_attendance_score + VALUES(sum_avg_attendance_score),
+        sum_avg_appraisal_rating = sum_avg_appraisal_rating + VALUES(sum_avg_appraisal_rating),
+        count_avg_kpi_score = count_avg_kpi_score + VALUES(count_avg_kpi_score),
+        count_avg_attendance_score = count_avg_attendance_score + VALUES(count_avg_attendance_score),
+        count_avg_appraisal_rating = count_avg_appraisal_rating + VALUES(count_avg_appraisal_rating);
+
+-- Rebuild the summary from existing rows (for databases that had data before the trigger existed)
+DELETE FROM employee_summary;
+INSERT INTO employee_summary (
+    employee_id, num_performance_records,
+    sum_kpi_score, sum_attendance_score, sum_appraisal_rating,
+    count_kpi_score, count_attendance_score, count_appraisal_rating,
+    max_performance_id, latest_performance_date,
+    latest_kpi_score, latest_attendance_score, latest_appraisal_rating
+)
+SELECT
+    t.employee_id, t.num_performance_records,
+    t.sum_kpi_score, t.sum_attendance_score, t.sum_appraisal_rating,
+    t.count_kpi_score, t.count_attendance_score, t.count_appraisal_rating,
+    t.max_performance_id, l.performance_date,
+    l.kpi_score, l.attendance_score, l.appraisal_rating
+FROM (
+    SELECT
+        employee_id,
+        COUNT(*) AS num_performance_records,
+        COALESCE(SUM(kpi_score), 0) AS sum_kpi_score,
+        COALESCE(SUM(attendance_score), 0) AS sum_attendance_score,
+        COALESCE(SUM(appraisal_rating), 0) AS sum_appraisal_rating,
+        COUNT(kpi_score) AS count_kpi_score,
+        COUNT(attendance_score) AS count_attendance_score,
+        COUNT(appraisal_rating) AS count_appraisal_rating,
+        MAX(performance_id) AS max_performance_id
+    FROM performance
+    GROUP BY employee_id
+) t, performance l
+WHERE l.performance_id = (
+    SELECT p.performance_id FROM performance p
+    WHERE p.employee_id = t.employee_id
+    ORDER BY p.performance_date DESC, p.performance_id DESC
+    LIMIT 1
+);
+
+-- Rebuilt after employee_summary, whose rebuild above fired the insert trigger on top of the old totals
+DELETE FROM department_position_summary;
+INSERT INTO department_position_summary (
+    department, position, num_employees,
+    sum_avg_kpi_score, sum_avg_attendance_score, sum_avg_appraisal_rating,
+    count_avg_kpi_score, count_avg_attendance_score, count_avg_appraisal_rating
+)
+SELECT
+    COALESCE(e.department, ''), COALESCE(e.position, ''), COUNT(*),
+    COALESCE(SUM(1e0 * s.sum_kpi_score / NULLIF(s.count_kpi_score, 0)), 0),
+    COALESCE(SUM(1e0 * s.sum_attendance_score / NULLIF(s.count_attendance_score, 0)), 0),
+    COALESCE(SUM(1e0 * s.sum_appraisal_rating / NULLIF(s.count_appraisal_rating, 0)), 0),
+    COUNT(NULLIF(s.count_kpi_score, 0)), COUNT(NULLIF(s.count_attendance_score, 0)), COUNT(NULLIF(s.count_appraisal_rating, 0))
+FROM employee_summary s
+JOIN employees e ON e.employee_id = s.employee_id
+GROUP BY COALESCE(e.department, ''), COALESCE(e.position, '');
@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+def _trigram_codes(keys):
+    """Returns (codes, key_ids) of every trigram in keys, packing the three code points into one int64."""
+    if len(keys) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    width = max(len(key) for key in keys)
+    # Fixed-width unicode arrays are UCS-4, so each key becomes a row of code points padded with zeros
+    points = np.array(keys, dtype=f'U{width}').view(np.uint32).reshape(len(keys), width).astype(np.int64)
+    if width < 3:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    codes = (points[:, :-2] << 42) | (points[:, 1:-1] << 21) | points[:, 2:]
+    present = points[:, 2:] != 0
+    key_ids = np.broadcast_to(np.arange(len(keys))[:, None], codes.shape)
+    return codes[present], key_ids[present]
+
+def _group_keys(keys, rows):
+    """Deduplicates and sorts keys; returns (keys, offsets, rows) with the rows of keys[i] at rows[offsets[i]:offsets[i + 1]]."""
+    codes, uniques = pd.factorize(keys, sort=True)
+    order = np.argsort(codes, kind='stable')
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(uniques)))))
+    # Fixed-width strings, unlike objects, can be published as memory-mapped arrays
+    return np.asarray(uniques, dtype=str), offsets, rows[order]
+
+class EmployeeSearchIndex:
+    """Prefix and trigram lookup of employees by name or email, for the searchable trend picker.
+
+    Searchable keys are the lowercased full name and email, then every
+    later word-start suffix of the name (so "kum" finds "Arjun Kumar").
+    Names repeat a lot, so keys are deduplicated and sorted once; a prefix
+    query is then a binary search over the sorted keys. Queries of three or
+    more characters that need more matches fall back to a trigram index over
+    full names and emails, which finds substrings anywhere in the key.
+    All of it is held in plain arrays (strings as fixed-width unicode), so
+    the shared-data loader builds it once and workers map it (see arrays).
+    """
+
+    def __init__(self, summary):
+        if summary.empty:
+            summary = pd.DataFrame({'employee_id': np.empty(0, dtype=np.int64), 'full_name': np.empty(0, dtype=object)})
+
+        self.employee_ids = summary['employee_id'].to_numpy()
+        full_names = summary['full_name'].astype(str)
+        # Kept for the option labels, and so covers() can tell whether a refreshed summary still matches this index
+        self.full_names = full_names.to_numpy(dtype=str)
+        self.emails = None
+        names = full_names.str.lower().to_numpy(dtype=object)
+        substring_keys = [names]
+        if 'email' in summary:
+            emails = summary['email'].astype(str).fillna('')
+            self.emails = emails.to_numpy(dtype=str)
+            substring_keys.append(emails.str.lower().to_numpy(dtype=object))
+
+        rows = np.arange(len(summary))
+        self.keys = _group_keys(np.concatenate(substring_keys), np.concatenate([rows] * len(substring_keys)))
+        # Word-start suffixes: "arjun kumar" is also findable as "kumar"
+        word_suffixes = pd.Series(names, dtype=object).str.split(' ').map(
+            lambda words: [' '.join(words[start:]) for start in range(1, len(words))]
+        ).explode().dropna()
+        self.word_keys = _group_keys(word_suffixes.to_numpy(dtype=object), word_suffixes.index.to_numpy())
+
+        # (trigram, key) pairs sorted by trigram; each trigram's keys are a contiguous, sorted run
+        codes, key_ids = _trigram_codes(self.keys[0].tolist())
+        order = np.lexsort((key_ids, codes))
+        self.trigrams = codes[order]
+        self.trigram_keys = key_ids[order].astype(np.int32) # There are one or two keys per employee
+
+    def arrays(self):
+        """Returns the index as a dict of plain arrays, for publishing as shared data (see from_arrays)."""
+        arrays = {'employee_ids': self.employee_ids, 'full_names': self.full_names, 'trigrams': self.trigrams, 'trigram_keys': self.trigram_keys}
+        for name in ('keys', 'word_keys'):
+            arrays[name], arrays[f'{name}_offsets'], arrays[f'{name}_rows'] = getattr(self, name)
+        if self.emails is not None:
+            arrays['emails'] = self.emails
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Wraps arrays from arrays() (e.g. memory-mapped from shared data) without copying."""
+        index = cls.__new__(cls)
+        index.employee_ids = arrays['employee_ids']
+        index.full_names = arrays['full_names']
+        index.emails = arrays.get('emails')
+        for name in ('keys', 'word_keys'):
+            setattr(index, name, (arrays[name], arrays[f'{name}_offsets'], arrays[f'{name}_rows']))
+        index.trigrams = arrays['trigrams']
+        index.trigram_keys = arrays['trigram_keys']
+        return index
+
+    def covers(self, summary, employee_ids=None):
+        """True when summary lists the same employees, names and emails as this index, which can then be reused.
+
+        Refreshes mostly change scores, so this check (a few vectorized
+        comparisons) spares rebuilding the sorted keys and trigrams. When
+        employee_ids is given, summary is known to differ from the indexed
+        summary only in those employees' rows, and only they are compared.
+        """
+        if summary.empty:
+            return len(self.employee_ids) == 0
+        if len(summary) != len(self.employee_ids) or ('email' in summary) != (self.emails is not None):
+            return False
+        if employee_ids is None:
+            rows = np.arange(len(summary))
+            if not np.array_equal(summary['employee_id'].to_numpy(), self.employee_ids):
+                return False
+        else:
+            employee_ids = np.unique(employee_ids)
+            rows = np.searchsorted(self.employee_ids, employee_ids)
+            # The same number of rows and no new employee among the changed ones means the same ids
+            if np.any(rows >= len(self.employee_ids)) or not np.array_equal(self.employee_ids[rows], employee_ids):
+                return False
+        if not np.array_equal(summary['full_name'].take(rows).astype(str).to_numpy(dtype=str), self.full_names[rows]):
+            return False
+        return self.emails is None or np.array_equal(summary['email'].take(rows).astype(str).fillna('').to_numpy(dtype=str), self.emails[rows])
+
+    @staticmethod
+    def _collect(grouped_keys, key_ids, limit, seen, matches):
+        # Appends the not yet seen rows of key_ids (in order) until matches holds limit rows
+        keys, offsets, rows = grouped_keys
+        for key_id in key_ids:
+            for row in rows[offsets[key_id]:offsets[key_id + 1]]:
+                if row not in seen:
+                    seen.add(row)
+                    matches.append(row)
+                    if len(matches) >= limit:
+                        return
+
+    def _prefix_key_ids(self, grouped_keys, query):
+        start, stop = np.searchsorted(grouped_keys[0], [query, query + '\U0010ffff'])
+        return range(start, stop)
+
+    def _substring_key_ids(self, query):
+        candidates = None
+        for code in np.unique(_trigram_codes([query])[0]):
+            start, stop = np.searchsorted(self.trigrams, [code, code + 1])
+            key_ids = self.trigram_keys[start:stop]
+            candidates = key_ids if candidates is None else np.intersect1d(candidates, key_ids, assume_unique=True)
+            if len(candidates) == 0:
+                return
+        # Trigrams can match out of order, so confirm the substring on the (sorted) candidate keys
+        keys = self.keys[0]
+        for key_id in candidates:
+            if query in keys[key_id]:
+                yield key_id
+
+    def search(self, query, limit=20):
+        """Returns up to limit {'label', 'value'} options for query, best matches first."""
+        query = (query or '').strip().lower()
+        if not query:
+            return []
+        seen = set()
+        rows = []
+        # Name/email prefixes first, then later word starts, then substrings anywhere
+        self._collect(self.keys, self._prefix_key_ids(self.keys, query), limit, seen, rows)
+        if len(rows) < limit:
+            self._collect(self.word_keys, self._prefix_key_ids(self.word_keys, query), limit, seen, rows)
+        if len(rows) < limit and len(query) >= 3:
+            self._collect(self.keys, self._substring_key_ids(query), limit, seen, rows)
+        return [{'label': self.label(row), 'value': int(self.employee_ids[row])} for row in rows]
+
+    def label(self, row):
+        # Names repeat, so the email tells employees with the same name apart
+        full_name, email = str(self.full_names[row]), str(self.emails[row]) if self.emails is not None else ''
+        return f'{full_name} ({email})' if email else full_name
+
+    def option(self, employee_id):
+        """Returns the dropdown option of one employee, or None if unknown."""
+        row = np.searchsorted(self.employee_ids, employee_id)
+        if row < len(self.employee_ids) and self.employee_ids[row] == employee_id:
+            return {'label': self.label(row), 'value': int(employee_id)}
+        return None
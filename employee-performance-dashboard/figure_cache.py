@@ -0,0 +1,54 @@
+import threading
+from collections import OrderedDict
+
+class FigureCache:
+    """Bounded, thread-safe LRU cache of figure payloads.
+
+    Keys are expected to include a data-version stamp, so entries built from
+    older data are never served; clear() drops them eagerly after a refresh.
+    """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+def normalize_selection(values):
+    """Turns a dropdown value (None or a list) into a hashable, order-independent key part."""
+    return tuple(sorted(set(values))) if values else ()
@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+
+AVERAGE_COLUMNS = ['avg_kpi_score', 'avg_attendance_score', 'avg_appraisal_rating']
+
+def _partials(summary):
+    # Employees without a department/position still count towards the unfiltered averages
+    grouped = summary.groupby(['department', 'position'], observed=True, dropna=False)
+    return pd.concat([
+        grouped[AVERAGE_COLUMNS].sum().add_prefix('sum_'),
+        grouped[AVERAGE_COLUMNS].count().add_prefix('count_'),
+        grouped.size().rename('num_employees')
+    ], axis=1)
+
+def _move_rows(rows_by_label, labels, rows, insert):
+    # Inserts rows under their labels (or removes them), keeping each label's positions sorted;
+    # missing labels are skipped, as groupby().indices does
+    for label, label_rows in pd.Series(rows).groupby(labels, sort=False):
+        label_rows = np.sort(label_rows.to_numpy())
+        current = rows_by_label.get(label, np.empty(0, dtype=np.intp))
+        if insert:
+            rows_by_label[label] = np.insert(current, np.searchsorted(current, label_rows), label_rows)
+        elif len(current) > len(label_rows):
+            rows_by_label[label] = np.delete(current, np.searchsorted(current, label_rows))
+        else:
+            del rows_by_label[label]
+
+class SummaryFilterIndex:
+    """Prebuilt lookup structures for slicing df_summary by department and position.
+
+    Each department and position maps to the sorted row positions holding it,
+    so a filter combination resolves to a row subset by concatenating and
+    intersecting those arrays instead of copying and scanning the frame.
+    Per-(department, position) sums and counts of the employee averages let
+    the overall and per-department means be combined from a few partials.
+    version is the data-version stamp of the summary being indexed; partials,
+    when given, are taken as they are (the database keeps them in precomputed
+    mode, see fetch_department_position_summary) instead of being grouped
+    from the summary.
+    """
+
+    def __init__(self, summary, version=0, partials=None):
+        self.summary = summary
+        self.version = version
+        if summary.empty:
+            self.employee_ids = np.empty(0, dtype=np.int64)
+            self.department_rows = {}
+            self.position_rows = {}
+            self.partials = pd.DataFrame()
+            return
+
+        self.employee_ids = summary['employee_id'].to_numpy() # Sorted, as the summary is built per employee_id
+        self.department_rows = summary.groupby('department', observed=True, sort=False).indices
+        self.position_rows = summary.groupby('position', observed=True, sort=False).indices
+
+        self.partials = _partials(summary) if partials is None else partials
+
+    def updated(self, summary, employee_ids, version=0, partials=None):
+        """Returns the index of summary, which differs from the indexed summary only in the rows of employee_ids.
+
+        Instead of regrouping the whole summary, the partials of those
+        employees' old rows are subtracted and those of their new rows added,
+        and only employees who are new or changed department or position move
+        between the row arrays; new employees shift the positions after them.
+        Given partials replace the patched ones, as in __init__.
+        """
+        if self.summary.empty or summary.empty:
+            return SummaryFilterIndex(summary, version=version, partials=partials)
+        index = SummaryFilterIndex.__new__(SummaryFilterIndex)
+        index.summary = summary
+        index.version = version
+        index.employee_ids = summary['employee_id'].to_numpy()
+
+        employee_ids = np.unique(employee_ids)
+        old_rows = np.searchsorted(self.employee_ids, employee_ids)
+        existing = old_rows < len(self.employee_ids)
+        existing[existing] = self.employee_ids[old_rows[existing]] == employee_ids[existing]
+        old_rows = old_rows[existing]
+        new_rows = np.searchsorted(index.employee_ids, employee_ids)
+        before, after = self.summary.take(old_rows), summary.take(new_rows)
+
+        hires = employee_ids[~existing]
+        for name in ('department', 'position'):
+            rows_by_label = getattr(self, f'{name}_rows')
+            if len(hires):
+                rows_by_label = {
+                    label: rows + np.searchsorted(hires, self.employee_ids[rows]) for label, rows in rows_by_label.items()
+                }
+            else:
+                rows_by_label = dict(rows_by_label)
+            old_labels, new_labels = before[name].to_numpy(dtype=object), after[name].to_numpy(dtype=object)
+            kept_labels = new_labels[existing]
+            changed = ~((old_labels == kept_labels) | (pd.isna(old_labels) & pd.isna(kept_labels)))
+            moved = np.flatnonzero(existing)[changed]
+            _move_rows(rows_by_label, old_labels[changed], new_rows[moved], insert=False)
+            arriving = np.concatenate((moved, np.flatnonzero(~existing)))
+            _move_rows(rows_by_label, new_labels[arriving], new_rows[arriving], insert=True)
+            setattr(index, f'{name}_rows', rows_by_label)
+
+        if partials is not None:
+            index.partials = partials
+            return index
+        index.partials = self.partials.sub(_partials(before), fill_value=0).add(_partials(after), fill_value=0)
+        # Groups whose last employee left are dropped, as a fresh groupby would not list them
+        index.partials = index.partials[index.partials['num_employees'] > 0]
+        return index
+
+    def arrays(self):
+        """Returns the department and position row lookups as flat arrays, for publishing as shared data.
+
+        Each label's rows are one run of {name}_rows, delimited by
+        {name}_offsets; see from_arrays.
+        """
+        arrays = {}
+        for name in ('department', 'position'):
+            rows_by_label = getattr(self, f'{name}_rows')
+            arrays[f'{name}_labels'] = np.array(list(rows_by_label), dtype=str)
+            arrays[f'{name}_offsets'] = np.concatenate(([0], np.cumsum([len(rows) for rows in rows_by_label.values()], dtype=np.int64)))
+            arrays[f'{name}_rows'] = np.concatenate([np.empty(0, dtype=np.intp), *rows_by_label.values()])
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, summary, arrays, partials, version=0):
+        """Wraps row lookups from arrays() (e.g. memory-mapped from shared data) without regrouping the summary.
+
+        Each label maps to a slice of the given arrays, so nothing is copied.
+        """
+        if summary.empty:
+            return cls(summary, version=version)
+        index = cls.__new__(cls)
+        index.summary = summary
+        index.version = version
+        index.employee_ids = summary['employee_id'].to_numpy()
+        for name in ('department', 'position'):
+            offsets, rows = arrays[f'{name}_offsets'], arrays[f'{name}_rows']
+            setattr(index, f'{name}_rows', {
+                label: rows[start:stop] for label, start, stop in zip(arrays[f'{name}_labels'].tolist(), offsets[:-1], offsets[1:])
+            })
+        index.partials = partials
+        return index
+
+    def rows(self, departments, positions):
+        """Returns the sorted row positions matching the selection, or None when nothing is filtered."""
+        selected = None
+        for lookup, values in ((self.department_rows, departments), (self.position_rows, positions)):
+            if not values:
+                continue
+            # Labels partition the rows, so the concatenated arrays are disjoint
+            matches = np.sort(np.concatenate([lookup.get(value, np.empty(0, dtype=np.intp)) for value in values]))
+            selected = matches if selected is None else np.intersect1d(selected, matches, assume_unique=True)
+        return selected
+
+    def full_name(self, employee_id):
+        """Looks up an employee's full name by binary search on the sorted ids (None if unknown)."""
+        row = np.searchsorted(self.employee_ids, employee_id)
+        if row < len(self.employee_ids) and self.employee_ids[row] == employee_id:
+            return self.summary['full_name'].iat[row]
+        return None
+
+    def subset(self, departments, positions):
+        rows = self.rows(departments, positions)
+        return self.summary if rows is None else self.summary.take(rows)
+
+    def _selected_partials(self, departments, positions):
+        partials = self.partials
+        if departments:
+            partials = partials[partials.index.get_level_values('department').isin(departments)]
+        if positions:
+            partials = partials[partials.index.get_level_values('position').isin(positions)]
+        return partials
+
+    def overall_averages(self, departments, positions):
+        """Mean of each employee-average column over the selection, as a list in AVERAGE_COLUMNS order."""
+        totals = self._selected_partials(departments, positions).sum()
+        return [totals[f'sum_{column}'] / totals[f'count_{column}'] for column in AVERAGE_COLUMNS]
+
+    def department_averages(self, departments, positions, column='avg_kpi_score'):
+        """Per-department mean of column over the selection, like groupby('department')[column].mean()."""
+        partials = self._selected_partials(departments, positions)
+        by_department = partials.groupby(level='department', observed=True)[[f'sum_{column}', f'count_{column}']].sum()
+        by_department[column] = by_department[f'sum_{column}'] / by_department[f'count_{column}']
+        return by_department[[column]].reset_index()
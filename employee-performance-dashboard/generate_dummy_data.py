@@ -1,47 +1,57 @@
+import argparse
+import collections
+import itertools
+import multiprocessing
+import time
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import mysql.connector
-from mysql.connector import Error
-import random
-
-# Database connection details
-DB_CONFIG = {
-    'host': 'localhost',
-    'database': 'employee_performance_db',
-    'user': 'root',  # Replace with your MySQL username
-    'password': 'Windows@11'  # Replace with your MySQL password
-}
-
-def create_db_connection():
-    """Establishes a connection to the MySQL database."""
-    connection = None
+from database_utils import get_pool, DatabaseError # Shared connection pool and backend
+
+DEPARTMENTS = ['HR', 'Engineering', 'Sales', 'Marketing', 'Finance', 'Operations', 'IT', 'Customer Service']
+POSITIONS = ['Analyst', 'Engineer', 'Manager', 'Specialist', 'Director', 'Associate', 'Developer', 'Designer', 'Coordinator']
+
+# --- START MODIFICATION FOR MEANINGFUL NAMES ---
+FIRST_NAMES = [
+    "Arjun", "Bharathi", "Chandran", "Deepa", "Elango", "Gomathi", "Hari", "Indira", "Jagadeesh", "Kalaivani",
+    "Lakshmi", "Murali", "Nithya", "Prabhu", "Revathi", "Saravanan", "Thamarai", "Uthra", "Velu", "Yamini",
+    "Anand", "Divya", "Ganesh", "Kavitha", "Manoj", "Priya", "Rajesh", "Shanthi", "Suresh", "Vimala"
+]
+LAST_NAMES = [
+    "Kumar", "Raj", "Mani", "Selvam", "Murugan", "Pillai", "Chettiar", "Nair", "Iyer", "Gopal",
+    "Devi", "Amma", "Nathan", "Rao", "Samy", "Vasanth", "Shankar", "Balan", "Rajan", "Sundaram","Kumar", "Raj", "Mani", "Selvam", "Murugan", "Pillai", "Nair", "Iyer", "Gopal","Reddy"
+]
+# --- END MODIFICATION ---
+FEEDBACK_OPTIONS = ["Excellent work!", "Good progress.", "Needs improvement in X.", "Met expectations.", "Exceeded expectations."]
+
+CHUNK_EMPLOYEES = 10_000 # Employees generated and inserted per chunk by the bulk loader
+BULK_INSERT_BATCH_ROWS = 1000 # Rows per multi-row INSERT statement
+CHUNKS_IN_FLIGHT_PER_WORKER = 2 # Chunks a worker may generate ahead of the inserts
+
+def clear_tables(connection):
+    """Removes all existing employee and performance rows (optional, for fresh runs)."""
+    cursor = connection.cursor()
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        if connection.is_connected():
-            print("Successfully connected to the database.")
-    except Error as e:
-        print(f"Error connecting to MySQL: {e}")
-    return connection
-
-def close_db_connection(connection):
-    """Closes the database connection."""
-    if connection and connection.is_connected():
-        connection.close()
-        print("MySQL connection closed.")
+        for statement in get_pool().backend.clear_tables_statements():
+            cursor.execute(statement)
+        connection.commit()
+        print("Cleared existing data from tables.")
+    except DatabaseError as e:
+        print(f"Error clearing data: {e}")
+    finally:
+        cursor.close()
 
 def insert_employees(connection, employees_data):
     """Inserts employee data into the employees table."""
     cursor = connection.cursor()
-    sql = """
+    sql = get_pool().backend.format_query("""
         INSERT INTO employees (first_name, last_name, department, position, hire_date, salary, email)
         VALUES (%s, %s, %s, %s, %s, %s, %s)
-    """
+    """)
     try:
         cursor.executemany(sql, employees_data)
         connection.commit()
         print(f"Inserted {len(employees_data)} employees.")
-    except Error as e:
+    except DatabaseError as e:
         print(f"Error inserting employees: {e}")
     finally:
         cursor.close()
@@ -49,85 +59,146 @@ def insert_employees(connection, employees_data):
 def insert_performance(connection, performance_data):
     """Inserts performance data into the performance table."""
     cursor = connection.cursor()
-    sql = """
+    sql = get_pool().backend.format_query("""
         INSERT INTO performance (employee_id, kpi_score, attendance_score, appraisal_rating, feedback, performance_date)
         VALUES (%s, %s, %s, %s, %s, %s)
-    """
+    """)
     try:
         cursor.executemany(sql, performance_data)
         connection.commit()
         print(f"Inserted {len(performance_data)} performance records.")
-    except Error as e:
+    except DatabaseError as e:
         print(f"Error inserting performance records: {e}")
     finally:
         cursor.close()
 
+def generate_dummy_data_chunk(first_employee_id, num_employees, num_performance_records_per_employee, seed=None):
+    """Generates one chunk of dummy data with vectorized NumPy draws.
+
+    Employees get explicit ids first_employee_id .. first_employee_id + num_employees - 1.
+    Returns (employees, performance_records) as lists of tuples of plain Python
+    values, ready for the database driver; employee tuples start with employee_id.
+    """
+    rng = np.random.default_rng(seed)
+    today = np.datetime64('today', 'D')
+
+    employee_ids = np.arange(first_employee_id, first_employee_id + num_employees)
+    first_names = rng.choice(FIRST_NAMES, num_employees)
+    last_names = rng.choice(LAST_NAMES, num_employees)
+    # Add the id to ensure uniqueness, since names repeat
+    emails = np.char.add(np.char.add(np.char.add(np.char.add(np.char.lower(first_names), '.'), np.char.lower(last_names)), employee_ids.astype(str)), '@example.com')
+    hire_dates = (today - rng.integers(365, 1826, num_employees)).astype(str) # 1-5 years ago
+    salaries = rng.uniform(40000, 120000, num_employees).round(2)
+
+    employees = list(zip(
+        employee_ids.tolist(), first_names.tolist(), last_names.tolist(),
+        rng.choice(DEPARTMENTS, num_employees).tolist(), rng.choice(POSITIONS, num_employees).tolist(),
+        hire_dates.tolist(), salaries.tolist(), emails.tolist()
+    ))
+
+    num_records = num_employees * num_performance_records_per_employee
+    performance_records = list(zip(
+        np.repeat(employee_ids, num_performance_records_per_employee).tolist(),
+        rng.uniform(0.5, 1.0, num_records).round(2).tolist(), # 0.5 to 1.0
+        rng.uniform(0.7, 1.0, num_records).round(2).tolist(), # 0.7 to 1.0
+        rng.integers(1, 6, num_records).tolist(), # 1 to 5
+        rng.choice(FEEDBACK_OPTIONS, num_records).tolist(),
+        (today - rng.integers(30, 731, num_records)).astype(str).tolist() # Last 2 years
+    ))
+    return employees, performance_records
+
 def generate_dummy_data(num_employees=50, num_performance_records_per_employee=6):
     """Generates dummy employee and performance data."""
-    departments = ['HR', 'Engineering', 'Sales', 'Marketing', 'Finance', 'Operations', 'IT', 'Customer Service']
-    positions = ['Analyst', 'Engineer', 'Manager', 'Specialist', 'Director', 'Associate', 'Developer', 'Designer', 'Coordinator']
-
-    # --- START MODIFICATION FOR MEANINGFUL NAMES ---
-    first_names = [
-        "Arjun", "Bharathi", "Chandran", "Deepa", "Elango", "Gomathi", "Hari", "Indira", "Jagadeesh", "Kalaivani",
-        "Lakshmi", "Murali", "Nithya", "Prabhu", "Revathi", "Saravanan", "Thamarai", "Uthra", "Velu", "Yamini",
-        "Anand", "Divya", "Ganesh", "Kavitha", "Manoj", "Priya", "Rajesh", "Shanthi", "Suresh", "Vimala"
-    ]
-    last_names = [
-        "Kumar", "Raj", "Mani", "Selvam", "Murugan", "Pillai", "Chettiar", "Nair", "Iyer", "Gopal",
-        "Devi", "Amma", "Nathan", "Rao", "Samy", "Vasanth", "Shankar", "Balan", "Rajan", "Sundaram","Kumar", "Raj", "Mani", "Selvam", "Murugan", "Pillai", "Nair", "Iyer", "Gopal","Reddy"
+    employees, performance_records = generate_dummy_data_chunk(1, num_employees, num_performance_records_per_employee)
+    # insert_employees lets the database assign ids, which start at 1 on fresh tables
+    return [employee[1:] for employee in employees], performance_records
+
+def _generate_chunk(args):
+    return generate_dummy_data_chunk(*args)
+
+def iter_dummy_data_chunks(num_employees, num_performance_records_per_employee, chunk_size=CHUNK_EMPLOYEES, workers=1, seed=None):
+    """Yields (employees, performance_records) chunks of at most chunk_size employees, in id order.
+
+    With workers > 1 the chunks are generated in a process pool. Every chunk
+    draws from its own stream spawned from seed, so a given seed yields the
+    same data whatever the number of workers.
+    """
+    chunk_starts = range(1, num_employees + 1, chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_starts))
+    chunk_args = [
+        (start, min(chunk_size, num_employees + 1 - start), num_performance_records_per_employee, chunk_seed)
+        for start, chunk_seed in zip(chunk_starts, seeds)
     ]
-    # --- END MODIFICATION ---
-
-    employees = []
-    performance_records = []
-
-    for i in range(1, num_employees + 1):
-        # --- MODIFIED: Use random meaningful names ---
-        first_name = random.choice(first_names)
-        last_name = random.choice(last_names)
-        # Add a number to ensure uniqueness if names repeat, especially for larger datasets
-        # Or you could check for unique email/full_name combinations
-        email = f"{first_name.lower()}.{last_name.lower()}{i}@example.com"
-        # --- END MODIFIED ---
-
-        department = random.choice(departments)
-        position = random.choice(positions)
-        hire_date = (datetime.now() - timedelta(days=random.randint(365, 1825))).strftime('%Y-%m-%d') # 1-5 years ago
-        salary = round(random.uniform(40000, 120000), 2)
-
-        employees.append((first_name, last_name, department, position, hire_date, salary, email))
-
-        for _ in range(num_performance_records_per_employee):
-            kpi_score = round(random.uniform(0.5, 1.0), 2) # 0.5 to 1.0
-            attendance_score = round(random.uniform(0.7, 1.0), 2) # 0.7 to 1.0
-            appraisal_rating = random.randint(1, 5) # 1 to 5
-            feedback = random.choice(["Excellent work!", "Good progress.", "Needs improvement in X.", "Met expectations.", "Exceeded expectations."])
-            performance_date = (datetime.now() - timedelta(days=random.randint(30, 730))).strftime('%Y-%m-%d') # Last 2 years
-            performance_records.append((i, kpi_score, attendance_score, appraisal_rating, feedback, performance_date))
 
-    return employees, performance_records
+    if workers <= 1:
+        for args in chunk_args:
+            yield _generate_chunk(args)
+        return
+
+    with multiprocessing.Pool(workers) as pool:
+        # Workers generate ahead of the inserts, but only CHUNKS_IN_FLIGHT_PER_WORKER chunks each;
+        # the next chunk is submitted when one is handed out, so finished chunks cannot pile up in memory
+        pending = collections.deque()
+        remaining = iter(chunk_args)
+        for args in itertools.islice(remaining, workers * CHUNKS_IN_FLIGHT_PER_WORKER):
+            pending.append(pool.apply_async(_generate_chunk, (args,)))
+        while pending:
+            chunk = pending.popleft().get()
+            for args in itertools.islice(remaining, 1):
+                pending.append(pool.apply_async(_generate_chunk, (args,)))
+            yield chunk
+
+def bulk_insert(connection, table, columns, rows, batch_size=BULK_INSERT_BATCH_ROWS):
+    """Inserts rows with multi-row INSERT statements of up to batch_size rows each."""
+    backend = get_pool().backend
+    row_placeholder = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    cursor = connection.cursor()
+    try:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            sql = backend.format_query(f"INSERT INTO {table} ({', '.join(columns)}) VALUES " + ", ".join([row_placeholder] * len(batch)))
+            cursor.execute(sql, [value for row in batch for value in row])
+        connection.commit()
+    finally:
+        cursor.close()
+    return len(rows)
+
+def bulk_load_dummy_data(connection, num_employees, num_performance_records_per_employee, chunk_size=CHUNK_EMPLOYEES, workers=1, seed=None):
+    """Generates and streams dummy data into the database chunk by chunk, reporting rows/sec."""
+    employee_columns = ['employee_id', 'first_name', 'last_name', 'department', 'position', 'hire_date', 'salary', 'email']
+    performance_columns = ['employee_id', 'kpi_score', 'attendance_score', 'appraisal_rating', 'feedback', 'performance_date']
+    inserted_employees = inserted_records = 0
+    start_time = time.perf_counter()
+
+    try:
+        for employees, performance_records in iter_dummy_data_chunks(
+                num_employees, num_performance_records_per_employee, chunk_size, workers, seed):
+            inserted_employees += bulk_insert(connection, 'employees', employee_columns, employees)
+            inserted_records += bulk_insert(connection, 'performance', performance_columns, performance_records)
+    except DatabaseError as e:
+        print(f"Error bulk loading data: {e}")
+
+    elapsed = time.perf_counter() - start_time
+    total_rows = inserted_employees + inserted_records
+    print(f"Inserted {inserted_employees} employees and {inserted_records} performance records "
+          f"in {elapsed:.1f}s ({total_rows / elapsed if elapsed else 0:,.0f} rows/s).")
+    return inserted_employees, inserted_records
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fill the database with dummy employee performance data.")
+    parser.add_argument('--employees', type=int, default=50, help="number of employees to generate")
+    parser.add_argument('--records-per-employee', type=int, default=6, help="performance records per employee")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_EMPLOYEES, help="employees generated and inserted per chunk")
+    parser.add_argument('--workers', type=int, default=1, help="processes used to generate chunks")
+    parser.add_argument('--seed', type=int, default=None, help="seed for reproducible data")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    connection = create_db_connection()
-    if connection:
-        employees_data, performance_data = generate_dummy_data()
-
-        # Clear existing data (optional, for fresh runs)
-        try:
-            cursor = connection.cursor()
-            # Important: Delete from 'performance' first due to foreign key constraint
-            cursor.execute("SET FOREIGN_KEY_CHECKS = 0;") # Temporarily disable FK checks
-            cursor.execute("TRUNCATE TABLE performance") # TRUNCATE is faster for full table clear
-            cursor.execute("TRUNCATE TABLE employees")   # TRUNCATE is faster for full table clear
-            cursor.execute("SET FOREIGN_KEY_CHECKS = 1;") # Re-enable FK checks
-            connection.commit()
-            print("Cleared existing data from tables.")
-        except Error as e:
-            print(f"Error clearing data: {e}")
-        finally:
-            cursor.close()
-
-        insert_employees(connection, employees_data)
-        insert_performance(connection, performance_data)
-        close_db_connection(connection)
\ No newline at end of file
+    args = parse_args()
+    try:
+        with get_pool().connection() as connection:
+            clear_tables(connection)
+            bulk_load_dummy_data(connection, args.employees, args.records_per_employee,
+                                 chunk_size=args.chunk_size, workers=args.workers, seed=args.seed)
+    except DatabaseError as e:
+        print(f"Error connecting to the database: {e}")
\ No newline at end of file
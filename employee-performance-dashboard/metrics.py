@@ -0,0 +1,106 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds, in seconds, of the stage latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+STAGE_DURATION = 'employee_dashboard_stage_duration_seconds'
+ROWS_FETCHED = 'employee_dashboard_rows_fetched_total'
+
+METRIC_HELP = {
+    STAGE_DURATION: 'Time spent in each loading and rendering stage.',
+    ROWS_FETCHED: 'Rows read from the database, per query.'
+}
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in labels) + '}'
+
+class MetricsRegistry:
+    """Thread-safe latency histograms and counters, rendered in the Prometheus text format.
+
+    Series are keyed by metric name plus a sorted tuple of label pairs, so the
+    same stage timed from several threads lands in one histogram.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for position, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram['buckets'][position] += 1
+            histogram['sum'] += seconds
+            histogram['count'] += 1
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start_time, **labels)
+
+    def render(self, samples=()):
+        """Returns all series as Prometheus exposition text.
+
+        samples are extra (name, type, help, value, labels) values owned by the
+        caller, such as cache statistics, appended after the registry's own.
+        """
+        with self._lock:
+            histograms = {key: {'buckets': list(value['buckets']), 'sum': value['sum'], 'count': value['count']}
+                          for key, value in self._histograms.items()}
+            counters = dict(self._counters)
+
+        lines = []
+        described = set()
+
+        def describe(name, metric_type, help_text):
+            if name not in described:
+                described.add(name)
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {metric_type}')
+
+        for (name, labels), histogram in sorted(histograms.items()):
+            describe(name, 'histogram', METRIC_HELP.get(name, name))
+            for bound, count in zip(self.buckets, histogram['buckets']):
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", bound),))} {count}')
+            lines.append(f'{name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {histogram["count"]}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {histogram["sum"]}')
+            lines.append(f'{name}_count{_format_labels(labels)} {histogram["count"]}')
+
+        for (name, labels), value in sorted(counters.items()):
+            describe(name, 'counter', METRIC_HELP.get(name, name))
+            lines.append(f'{name}{_format_labels(labels)} {value}')
+
+        # A metric's samples must be contiguous in the exposition, so group them by name
+        for name, metric_type, help_text, value, labels in sorted(samples, key=lambda sample: sample[0]):
+            describe(name, metric_type, help_text)
+            lines.append(f'{name}{_format_labels(tuple(sorted(labels.items())))} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+# Process-wide registry; every worker process exports its own numbers
+registry = MetricsRegistry()
+
+def time_stage(stage, **labels):
+    """Context manager recording the duration of a stage in the stage latency histogram."""
+    return registry.timer(STAGE_DURATION, stage=stage, **labels)
+
+def count_rows(query, rows):
+    registry.increment(ROWS_FETCHED, rows, query=query)
@@ -0,0 +1,9 @@
+from database_utils import apply_schema_indexes, get_pool, SCHEMA_INDEXES
+
+# Adds the composite indexes of SCHEMA_INDEXES to an existing database; indexes already present are skipped.
+# Building an index on a large performance table takes a while and, on older MySQL versions, locks the table.
+if __name__ == "__main__":
+    print(f"Checking {len(SCHEMA_INDEXES)} indexes on the {get_pool().backend.name} database...")
+    created = apply_schema_indexes()
+    if created is not None:
+        print(f"Created {len(created)} indexes: {', '.join(created)}." if created else "All indexes already exist.")
@@ -0,0 +1,128 @@
+from functools import cached_property
+import numpy as np
+import pandas as pd
+from data_processing import METRIC_COLUMNS, ATTRIBUTE_COLUMNS, LATEST_COLUMNS, TOTAL_COLUMNS, finalize_summary
+from trend_index import insert_rows
+
+def to_month(dates):
+    """Converts datetimes to months since 1970-01, the bucket key used by MonthlyRollup."""
+    return np.asarray(dates).astype('datetime64[M]').astype(np.int64)
+
+def month_label(month):
+    return pd.Timestamp(np.datetime64(int(month), 'M')).strftime('%b %Y')
+
+def _bucket_keys(buckets):
+    # (month, employee_id) packed into one int64 that sorts like the pair
+    return (buckets['month'].to_numpy().astype(np.int64) << 32) | buckets['employee_id'].to_numpy().astype(np.int64)
+
+def build_buckets(df):
+    """Reduces raw performance rows to one row per (month, employee) with partial totals and the bucket's latest record."""
+    rows = df[['employee_id', 'performance_date'] + METRIC_COLUMNS].assign(month=to_month(df['performance_date']).astype(np.int32))
+    grouped = rows.groupby(['month', 'employee_id'], sort=True)
+    # Per-bucket counts are small; int32 keeps the rollup compact (window totals are summed in int64)
+    buckets = pd.concat([
+        grouped[METRIC_COLUMNS].sum().add_prefix('sum_'),
+        grouped[METRIC_COLUMNS].count().astype(np.int32).add_prefix('count_'),
+        grouped.size().astype(np.int32).rename('num_performance_records')
+    ], axis=1)
+
+    # Newest record per bucket; equal dates go to the higher performance_id, like the loaders and the summary trigger
+    sort_columns = ['month', 'employee_id', 'performance_date']
+    if 'performance_id' in df:
+        rows = rows.assign(performance_id=df['performance_id'])
+        sort_columns.append('performance_id')
+    latest = rows.sort_values(sort_columns, ascending=[True, True] + [False] * (len(sort_columns) - 2), kind='mergesort')
+    latest = latest.drop_duplicates(['month', 'employee_id']).set_index(['month', 'employee_id'])
+    for metric in METRIC_COLUMNS:
+        buckets[f'latest_{metric}'] = latest[metric]
+    buckets['latest_performance_date'] = latest['performance_date']
+    return buckets.reset_index()
+
+class MonthlyRollup:
+    """Per-employee, per-month partial sums and counts of the metrics plus each bucket's latest record.
+
+    Buckets are sorted by (month, employee_id), so the buckets of a window of
+    months are one contiguous slice, and a window summary is combined from
+    those partials (totals added up, latest values taken from the newest
+    bucket) instead of re-aggregating the raw performance rows. Employee
+    attributes come from the summary the rollup was built alongside.
+    version is the data-version stamp shared with the summary's filter index.
+    """
+
+    def __init__(self, df, summary, version=0):
+        buckets = pd.DataFrame() if df.empty or summary.empty else build_buckets(df)
+        self._wrap(buckets, summary, version)
+
+    @classmethod
+    def from_buckets(cls, buckets, summary, version=0):
+        """Wraps buckets built elsewhere (merged on refresh, or memory-mapped from shared data) without copying."""
+        rollup = cls.__new__(cls)
+        rollup._wrap(buckets, summary, version)
+        return rollup
+
+    def _wrap(self, buckets, summary, version):
+        self.version = version
+        self.summary = summary
+        if buckets.empty or summary.empty:
+            buckets = pd.DataFrame()
+        self.buckets = buckets
+        self.months = buckets['month'].to_numpy() if not buckets.empty else np.empty(0, dtype=np.int64)
+
+    @cached_property
+    def attributes(self):
+        # Only needed once a window is selected, so shared-data workers do not copy it up front
+        return self.summary.set_index('employee_id')[ATTRIBUTE_COLUMNS + ['max_performance_id']]
+
+    def merge_buckets(self, df_new):
+        """Returns these buckets with the raw rows of df_new folded in, for MonthlyRollup.from_buckets.
+
+        Only df_new is grouped: its partials are added to the buckets of the
+        same (month, employee), whose latest record is replaced when the new
+        one is at least as new, and buckets seen for the first time are
+        inserted in key order (see insert_rows), so nothing is re-sorted.
+        """
+        if df_new.empty:
+            return self.buckets
+        new_buckets = build_buckets(df_new)
+        if self.buckets.empty:
+            return new_buckets
+
+        old_keys, new_keys = _bucket_keys(self.buckets), _bucket_keys(new_buckets)
+        positions = np.searchsorted(old_keys, new_keys)
+        existing = positions < len(old_keys)
+        existing[existing] = old_keys[positions[existing]] == new_keys[existing]
+
+        # Each new bucket matches at most one existing bucket, so plain fancy-indexed updates suffice
+        columns = {column: self.buckets[column].to_numpy().copy() for column in self.buckets.columns}
+        targets, updates = positions[existing], new_buckets[existing]
+        for column in TOTAL_COLUMNS:
+            columns[column][targets] += updates[column].to_numpy()
+        # Refreshed rows have higher performance ids, so they also win equal dates
+        newer = updates['latest_performance_date'].to_numpy() >= columns['latest_performance_date'][targets]
+        for column in LATEST_COLUMNS:
+            columns[column][targets[newer]] = updates[column].to_numpy()[newer]
+
+        return insert_rows(columns, new_buckets[~existing].reset_index(drop=True), positions[~existing])
+
+    @property
+    def month_range(self):
+        """(first, last) month holding any record, or None when there is no data."""
+        if len(self.months) == 0:
+            return None
+        return int(self.months[0]), int(self.months[-1])
+
+    def window_summary(self, first_month, last_month):
+        """Builds a df_summary-shaped frame from the records dated in first_month..last_month (inclusive).
+
+        Only employees with records in the window are included.
+        """
+        start, stop = np.searchsorted(self.months, [first_month, last_month + 1])
+        window = self.buckets.iloc[start:stop]
+        if window.empty:
+            return pd.DataFrame()
+
+        totals = window.groupby('employee_id', sort=True)[TOTAL_COLUMNS].sum()
+        # Buckets are in month order, so an employee's last bucket in the window is their newest one
+        latest = window.drop_duplicates('employee_id', keep='last').set_index('employee_id')[LATEST_COLUMNS]
+        combined = self.attributes.join(totals, how='inner').join(latest)
+        return finalize_summary(combined.rename_axis('employee_id').reset_index())
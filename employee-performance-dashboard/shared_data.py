@@ -0,0 +1,109 @@
+import json
+import os
+import shutil
+import time
+import pandas as pd
+from employee_search import EmployeeSearchIndex
+from filter_index import SummaryFilterIndex
+from snapshot import read_snapshot, write_snapshot, MANIFEST_FILE
+from trend_index import EmployeeTrendIndex
+
+POINTER_FILE = 'CURRENT' # Names the version directory workers should attach to
+KEEP_VERSIONS = 2 # Older versions are removed once a newer one is published
+
+def _version_directory(directory, version):
+    return os.path.join(directory, f'v{version:06d}')
+
+def current_version(directory):
+    """Returns the version the pointer file names, or None if nothing was published yet."""
+    try:
+        with open(os.path.join(directory, POINTER_FILE)) as f:
+            return int(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _published_frames(version_directory):
+    try:
+        with open(os.path.join(version_directory, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return set()
+    return set(manifest['frames']) | set(manifest.get('arrays', {}))
+
+def publish_shared_data(directory, summary, trend_index, rollup_buckets, summary_index=None, search_index=None,
+                        search_unchanged=False):
+    """Materializes the summary, the date-ordered trend rows and the monthly rollup buckets as memory-mappable columns.
+
+    summary_index and search_index, when given, are published too (as flat
+    arrays, plus the partials as a frame), so workers map them instead of
+    each regrouping the summary and rebuilding the trigrams. With
+    search_unchanged the search index is the one published with the previous
+    version, whose files are then linked rather than written again; workers
+    moving to the new version also keep the same pages.
+    The new version is written to its own directory first, then the pointer
+    file is replaced atomically, so workers switch from one complete version
+    to the next and never see a partial one.
+    """
+    os.makedirs(directory, exist_ok=True)
+    version = (current_version(directory) or 0) + 1
+    frames = {
+        'summary': summary,
+        'trend': trend_index.ordered,
+        'trend_offsets': pd.DataFrame({'offset': trend_index.offsets}),
+        'rollup': rollup_buckets
+    }
+    if summary_index is not None:
+        frames['summary_index'] = summary_index.arrays()
+        frames['summary_partials'] = summary_index.partials.reset_index()
+    linked = {}
+    if search_index is not None:
+        previous_directory = _version_directory(directory, version - 1)
+        if search_unchanged and 'employee_search' in _published_frames(previous_directory):
+            linked['employee_search'] = previous_directory
+        else:
+            frames['employee_search'] = search_index.arrays()
+    write_snapshot(_version_directory(directory, version), frames, {'version': version}, linked=linked)
+
+    temp_pointer = os.path.join(directory, POINTER_FILE + '.tmp')
+    with open(temp_pointer, 'w') as f:
+        f.write(str(version))
+    os.replace(temp_pointer, os.path.join(directory, POINTER_FILE))
+
+    # Workers still mapping an old version keep their mapping after the files are unlinked
+    for old_version in range(1, version - KEEP_VERSIONS + 1):
+        shutil.rmtree(_version_directory(directory, old_version), ignore_errors=True)
+    return version
+
+def attach_shared_data(directory):
+    """Maps the current version read-only.
+
+    Returns (version, summary, trend_index, rollup_buckets, summary_index,
+    search_index), or None if no version is available. Numeric and date
+    columns are views on the page cache shared by every process attached to
+    the same version; string columns stay categoricals over their mapped
+    codes rather than being decoded into private arrays. rollup_buckets and
+    the indexes are None for versions published without them.
+    """
+    version = current_version(directory)
+    if version is None:
+        return None
+    frames, _ = read_snapshot(_version_directory(directory, version), {'version': version}, decode_strings=False)
+    if frames is None:
+        return None
+    trend_index = EmployeeTrendIndex.from_ordered(frames['trend'], frames['trend_offsets']['offset'].to_numpy())
+    summary_index = None
+    if 'summary_index' in frames:
+        partials = frames['summary_partials']
+        summary_index = SummaryFilterIndex.from_arrays(
+            frames['summary'], frames['summary_index'], partials.set_index(['department', 'position']) if not partials.empty else partials
+        )
+    search_index = EmployeeSearchIndex.from_arrays(frames['employee_search']) if 'employee_search' in frames else None
+    return version, frames['summary'], trend_index, frames.get('rollup'), summary_index, search_index
+
+if __name__ == "__main__":
+    # Run the single loader process: the app's warmup and refresher publish every data version
+    # into EMPLOYEE_DASHBOARD_SHARED_DIR, which the server workers attach to.
+    os.environ['EMPLOYEE_DASHBOARD_SHARED_ROLE'] = 'loader'
+    import app
+    while True:
+        time.sleep(3600)
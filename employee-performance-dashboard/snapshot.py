@@ -0,0 +1,122 @@
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+MANIFEST_FILE = 'manifest.json'
+
+def _column_file(frame_name, position):
+    return f'{frame_name}.{position}.npy'
+
+def write_snapshot(directory, frames, fingerprint, linked=None):
+    """Writes DataFrames as one .npy file per column plus a manifest holding the source fingerprint.
+
+    Numeric and datetime columns are stored as-is so they can be memory-mapped
+    on load. String and categorical columns are stored as integer
+    codes with their categories in the manifest. A frame may also be a dict of
+    NumPy arrays of any lengths (e.g. index structures), each stored as it is;
+    object arrays cannot be mapped, so strings need a fixed-width dtype.
+    linked maps frame names to earlier snapshot directories holding them
+    unchanged; those files are hard-linked instead of written again. The
+    snapshot is assembled in a temporary directory and swapped in, so readers
+    never see a partial one.
+    """
+    temp_directory = directory + '.tmp'
+    shutil.rmtree(temp_directory, ignore_errors=True)
+    os.makedirs(temp_directory)
+
+    manifest = {'fingerprint': fingerprint, 'frames': {}, 'arrays': {}}
+    for frame_name, source_directory in (linked or {}).items():
+        with open(os.path.join(source_directory, MANIFEST_FILE)) as f:
+            source_manifest = json.load(f)
+        section = 'arrays' if frame_name in source_manifest.get('arrays', {}) else 'frames'
+        for entry in source_manifest[section][frame_name]:
+            os.link(os.path.join(source_directory, entry['file']), os.path.join(temp_directory, entry['file']))
+        manifest[section][frame_name] = source_manifest[section][frame_name]
+    for frame_name, df in frames.items():
+        if isinstance(df, dict):
+            entries = []
+            for position, (name, array) in enumerate(df.items()):
+                array = np.asarray(array)
+                if array.dtype == object:
+                    raise TypeError(f"Array {frame_name}.{name} has dtype object, which cannot be memory-mapped.")
+                entry = {'name': name, 'file': _column_file(frame_name, position)}
+                np.save(os.path.join(temp_directory, entry['file']), array)
+                entries.append(entry)
+            manifest['arrays'][frame_name] = entries
+            continue
+        columns = []
+        for position, column in enumerate(df.columns):
+            values = df[column]
+            entry = {'name': column, 'file': _column_file(frame_name, position)}
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                entry['kind'] = 'categorical'
+                entry['categories'] = values.cat.categories.tolist()
+                array = values.cat.codes.to_numpy()
+            elif pd.api.types.is_numeric_dtype(values) or pd.api.types.is_datetime64_dtype(values):
+                entry['kind'] = 'array'
+                array = values.to_numpy()
+            else:
+                # Strings cannot be memory-mapped; names and feedback repeat a lot, so codes are compact
+                categorical = values.astype('category')
+                entry['kind'] = 'encoded'
+                entry['dtype'] = str(values.dtype)
+                entry['categories'] = categorical.cat.categories.tolist()
+                array = categorical.cat.codes.to_numpy()
+            np.save(os.path.join(temp_directory, entry['file']), array)
+            columns.append(entry)
+        manifest['frames'][frame_name] = columns
+
+    with open(os.path.join(temp_directory, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, default=str)
+
+    old_directory = directory + '.old'
+    shutil.rmtree(old_directory, ignore_errors=True)
+    if os.path.exists(directory):
+        os.rename(directory, old_directory)
+    os.rename(temp_directory, directory)
+    shutil.rmtree(old_directory, ignore_errors=True)
+
+def read_snapshot(directory, fingerprint=None, decode_strings=True):
+    """Loads a snapshot written by write_snapshot() if its fingerprint matches (any, if fingerprint is None).
+
+    Plain columns and dict frames are memory-mapped read-only rather than
+    read into memory. String columns are decoded back to their dtype, which
+    builds private string arrays; with decode_strings=False they stay
+    categoricals whose codes are the mapped array. Returns
+    (frames, bytes_on_disk), or (None, 0) when the snapshot is missing or
+    stale.
+    """
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None, 0
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    # Round-trip through JSON so the comparison matches what was stored
+    if fingerprint is not None and manifest['fingerprint'] != json.loads(json.dumps(fingerprint, default=str)):
+        return None, 0
+
+    frames = {}
+    bytes_on_disk = os.path.getsize(manifest_path)
+    for frame_name, columns in manifest['frames'].items():
+        data = {}
+        for entry in columns:
+            path = os.path.join(directory, entry['file'])
+            bytes_on_disk += os.path.getsize(path)
+            array = np.load(path, mmap_mode='r')
+            if entry['kind'] == 'array':
+                data[entry['name']] = array
+            else:
+                values = pd.Categorical.from_codes(array, categories=entry['categories'])
+                decode = entry['kind'] == 'encoded' and decode_strings
+                data[entry['name']] = pd.Series(values).astype(entry['dtype']) if decode else values
+        # copy=False keeps the memory-mapped arrays as the column storage
+        frames[frame_name] = pd.DataFrame(data, copy=False)
+    for frame_name, entries in manifest.get('arrays', {}).items():
+        frames[frame_name] = {}
+        for entry in entries:
+            path = os.path.join(directory, entry['file'])
+            bytes_on_disk += os.path.getsize(path)
+            frames[frame_name][entry['name']] = np.load(path, mmap_mode='r')
+    return frames, bytes_on_disk
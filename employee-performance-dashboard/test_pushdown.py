@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+from conftest import reload
+
+@pytest.mark.parametrize('departments, positions', [(None, None), (None, ['Manager', 'Director']), (['Sales', 'IT'], None)])
+def test_pushdown_aggregates_match_in_memory(app_module, departments, positions):
+    app, _ = app_module
+    reload(app)
+    selected = app.df_summary
+    if departments:
+        selected = selected[selected['department'].isin(departments)]
+    if positions:
+        selected = selected[selected['position'].isin(positions)]
+
+    aggregates = app.fetch_dashboard_aggregates(departments, positions, top_n=10, histogram_bins=app.ATTENDANCE_BINS)
+    # Both modes rank and bin on the same rounded score keys, so ties and bin edges agree exactly
+    top, bottom = app.rank_performers(selected, 'avg_kpi_score', 10)
+    assert list(aggregates['top']['employee_id']) == list(top['employee_id'])
+    assert list(aggregates['bottom']['employee_id']) == list(bottom['employee_id'])
+    counts, edges = app.score_histogram(selected['avg_attendance_score'], app.ATTENDANCE_BINS)
+    assert list(aggregates['attendance_histogram'][0]) == list(counts)
+    np.testing.assert_allclose(aggregates['attendance_histogram'][1], edges)
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import reload
+from database_utils import SQLiteBackend
+from trend_index import EmployeeTrendIndex
+from monthly_rollup import MonthlyRollup
+from filter_index import SummaryFilterIndex
+
+def assert_same_summary(refreshed, reloaded):
+    refreshed = refreshed.sort_values('employee_id', ignore_index=True)
+    reloaded = reloaded.sort_values('employee_id', ignore_index=True)
+    # Refreshed rows mix float32 and float64 scores in compact mode, but categorical columns must stay categorical
+    categorical = [column for column in reloaded if isinstance(reloaded[column].dtype, pd.CategoricalDtype)]
+    assert refreshed[categorical].dtypes.equals(reloaded[categorical].dtypes)
+    pd.testing.assert_frame_equal(refreshed, reloaded, check_dtype=False, rtol=1e-6)
+
+# Each case touches its own employees, so one case's inserts cannot mask a failure in the other
+@pytest.mark.parametrize('compact_load, employee_id, other_employee_id', [(False, 3, 5), (True, 4, 6)])
+def test_refresh_matches_full_reload(app_module, monkeypatch, compact_load, employee_id, other_employee_id):
+    app, pool = app_module
+    monkeypatch.setattr(app, 'COMPACT_LOAD', compact_load)
+    reload(app)
+
+    with pool.connection() as connection:
+        newest = connection.execute("SELECT MAX(performance_date) FROM performance").fetchone()[0]
+        newer = (pd.Timestamp(newest) + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+        # A newer record with a missing KPI score must become the latest one, NULL included;
+        # the cleared salary must replace the old one too
+        connection.execute("UPDATE employees SET salary = NULL WHERE employee_id = ?", (employee_id,))
+        connection.execute(
+            "INSERT INTO performance (employee_id, kpi_score, attendance_score, appraisal_rating, feedback, performance_date) "
+            "VALUES (?, NULL, 0.91, 4, 'Met expectations.', ?)", (employee_id, newer)
+        )
+        connection.execute(
+            "INSERT INTO performance (employee_id, kpi_score, attendance_score, appraisal_rating, feedback, performance_date) "
+            "VALUES (?, 0.75, NULL, 3, 'Good progress.', ?)", (other_employee_id, newer)
+        )
+        connection.commit()
+
+    search_index = app.employee_search
+    assert app.refresh_data() == 2
+    # Only scores and a salary changed, so the search index is reused rather than rebuilt
+    assert app.employee_search is search_index
+    row = app.df_summary.set_index('employee_id').loc[employee_id]
+    assert pd.isna(row['latest_kpi_score']) and pd.isna(row['salary'])
+    assert_matches_reload(app, [employee_id, other_employee_id])
+
+    with pool.connection() as connection:
+        # A new hire in a department the summary has not seen yet, and an existing employee moving into it
+        cursor = connection.execute(
+            "INSERT INTO employees (first_name, last_name, department, position, hire_date, salary, email) "
+            "VALUES ('Nila', 'Rao', ?, 'Analyst', '2024-02-01', 119999.99, ?)", (f'Legal {employee_id}', f'nila.rao.{employee_id}@example.com')
+        )
+        new_employee_id = cursor.lastrowid
+        connection.execute("UPDATE employees SET department = ? WHERE employee_id = ?", (f'Legal {employee_id}', other_employee_id))
+        later = (pd.Timestamp(newer) + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+        for employee in (new_employee_id, other_employee_id):
+            connection.execute(
+                "INSERT INTO performance (employee_id, kpi_score, attendance_score, appraisal_rating, feedback, performance_date) "
+                "VALUES (?, 0.66, 0.8, 4, 'Good progress.', ?)", (employee, later)
+            )
+        # A second record on the date of the one merged above must land after it, as a rebuild orders it
+        connection.execute(
+            "INSERT INTO performance (employee_id, kpi_score, attendance_score, appraisal_rating, feedback, performance_date) "
+            "VALUES (?, 0.58, 0.77, 2, 'Needs improvement in X.', ?)", (employee_id, newer)
+        )
+        connection.commit()
+
+    assert app.refresh_data() == 3
+    trend = app.trend_index.lookup(employee_id)
+    assert list(trend['kpi_score'].iloc[-2:].isna()) == [True, False]
+    assert app.employee_search.option(new_employee_id) is not None
+    assert_matches_reload(app, [employee_id, other_employee_id, new_employee_id])
+    # Salaries keep their cents in the compact load too (float32 would hold 119999.9921875)
+    assert float(app.df_summary.set_index('employee_id').loc[new_employee_id, 'salary']) == 119999.99
+    reload(app)
+    assert float(app.df_summary.set_index('employee_id').loc[new_employee_id, 'salary']) == 119999.99
+
+def assert_matches_reload(app, employee_ids):
+    """Checks the refreshed summary and every structure patched or merged on refresh against a full reload."""
+    reloaded_raw, reloaded = app.load_from_database()
+    assert_same_summary(app.df_summary, reloaded)
+
+    # The filter index is patched for the refreshed employees rather than rebuilt
+    rebuilt_index = SummaryFilterIndex(reloaded)
+    for name in ('department_rows', 'position_rows'):
+        refreshed_rows, rebuilt_rows = getattr(app.summary_index, name), getattr(rebuilt_index, name)
+        assert sorted(refreshed_rows) == sorted(rebuilt_rows)
+        for label, rows in rebuilt_rows.items():
+            np.testing.assert_array_equal(refreshed_rows[label], rows)
+    pd.testing.assert_frame_equal(app.summary_index.partials.sort_index().reset_index(), rebuilt_index.partials.sort_index().reset_index(),
+                                  check_dtype=False, check_categorical=False, rtol=1e-6)
+
+    # The trend index and monthly buckets are merged incrementally on refresh; they must match ones rebuilt from the reload
+    pd.testing.assert_frame_equal(app.monthly_rollup.buckets, MonthlyRollup(reloaded_raw, reloaded).buckets, check_dtype=False, rtol=1e-6)
+    rebuilt = EmployeeTrendIndex(reloaded_raw)
+    for employee in employee_ids:
+        pd.testing.assert_frame_equal(app.trend_index.lookup(employee).reset_index(drop=True),
+                                      rebuilt.lookup(employee).reset_index(drop=True), check_dtype=False)
+
+def test_department_summary_matches_summary(app_module, monkeypatch):
+    app, pool = app_module
+    monkeypatch.setattr(app, 'PRECOMPUTED_SUMMARY', True)
+    reload(app)
+
+    with pool.connection() as connection:
+        newest = connection.execute("SELECT MAX(performance_date) FROM performance").fetchone()[0]
+        # One employee gains a record, one moves without a new record, and one new hire has no department
+        connection.execute(
+            "INSERT INTO performance (employee_id, kpi_score, attendance_score, appraisal_rating, feedback, performance_date) "
+            "VALUES (7, 0.52, NULL, 2, 'Needs improvement in X.', ?)", (newest,)
+        )
+        connection.execute("UPDATE employees SET department = 'Legal', position = 'Director' WHERE employee_id = 8")
+        cursor = connection.execute(
+            "INSERT INTO employees (first_name, last_name, department, position, hire_date, salary, email) "
+            "VALUES ('Velu', 'Nair', NULL, 'Analyst', '2024-03-01', 52000, 'velu.nair.new@example.com')"
+        )
+        connection.execute(
+            "INSERT INTO performance (employee_id, kpi_score, attendance_score, appraisal_rating, feedback, performance_date) "
+            "VALUES (?, 0.8, 0.9, 5, 'Excellent work!', ?)", (cursor.lastrowid, newest)
+        )
+        connection.commit()
+
+    # The moved employee has no new record, so the refresh re-reads only the other two
+    assert app.refresh_data() == 2
+    grouped = SummaryFilterIndex(app.load_from_database()[1]).partials
+    maintained = app.get_precomputed_partials()
+    pd.testing.assert_frame_equal(maintained.sort_index().reset_index(), grouped.sort_index().reset_index(),
+                                  check_dtype=False, check_categorical=False, check_index_type=False, rtol=1e-9)
+    # The bars read the database partials, including the move the refresh did not see
+    pd.testing.assert_frame_equal(app.summary_index.partials, maintained)
+    assert 'Legal' in list(app.summary_index.department_averages(None, None)['department'])
+
+    # Databases that had summaries before the table existed get it filled on connect
+    with pool.connection() as connection:
+        connection.execute("DELETE FROM department_position_summary")
+        connection.commit()
+    SQLiteBackend(pool.backend.path).connect().close()
+    pd.testing.assert_frame_equal(app.get_precomputed_partials(), maintained, rtol=1e-9)
@@ -0,0 +1,158 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from data_processing import aggregate_performance, finalize_summary, preprocess_performance_data
+from generate_dummy_data import generate_dummy_data_chunk
+from employee_search import EmployeeSearchIndex
+from filter_index import SummaryFilterIndex
+from monthly_rollup import MonthlyRollup, to_month
+from shared_data import attach_shared_data, current_version, publish_shared_data, KEEP_VERSIONS
+from snapshot import read_snapshot, write_snapshot
+from trend_index import EmployeeTrendIndex
+
+EMPLOYEE_COLUMNS = ['employee_id', 'first_name', 'last_name', 'department', 'position', 'hire_date', 'salary', 'email']
+PERFORMANCE_COLUMNS = ['employee_id', 'kpi_score', 'attendance_score', 'appraisal_rating', 'feedback', 'performance_date']
+
+def load_sample(num_employees=30, seed=5):
+    """Returns (raw, summary) built like the joined load, with the missing values snapshots must keep."""
+    employees, records = generate_dummy_data_chunk(1, num_employees, 4, seed=seed)
+    employees = pd.DataFrame(employees, columns=EMPLOYEE_COLUMNS)
+    employees.loc[1, 'email'] = None
+    employees.loc[2, 'salary'] = np.nan
+    employees.loc[3, 'department'] = None
+    records = pd.DataFrame(records, columns=PERFORMANCE_COLUMNS)
+    records.insert(0, 'performance_id', np.arange(1, len(records) + 1))
+    records.loc[0, 'kpi_score'] = np.nan
+    raw = records.merge(employees, on='employee_id').sort_values(
+        ['employee_id', 'performance_date', 'performance_id'], ascending=[True, False, False], ignore_index=True)
+    raw = preprocess_performance_data(raw)
+    summary = finalize_summary(aggregate_performance(raw))
+    summary['department'] = summary['department'].astype('category')
+    return raw, summary
+
+def assert_mapped_frame_equal(mapped, expected):
+    # Mapped columns are np.memmap subclasses, which assert_frame_equal tells apart from plain arrays;
+    # attached string columns are categoricals and are compared decoded
+    pd.testing.assert_frame_equal(mapped.copy().astype(expected.dtypes.to_dict()), expected)
+
+def is_mapped(array):
+    while array is not None and not isinstance(array, np.memmap):
+        array = array.base
+    return array is not None
+
+def test_snapshot_round_trip(tmp_path):
+    raw, summary = load_sample()
+    directory = str(tmp_path / 'snapshot')
+    write_snapshot(directory, {'raw': raw, 'summary': summary}, {'rows': len(raw)})
+
+    frames, bytes_read = read_snapshot(directory, {'rows': len(raw)})
+    assert bytes_read > 0
+    assert_mapped_frame_equal(frames['raw'], raw)
+    assert_mapped_frame_equal(frames['summary'], summary)
+    assert pd.isna(frames['summary']['email'].iat[1]) and np.isnan(frames['summary']['salary'].iat[2])
+    assert pd.isna(frames['summary']['department'].iat[3]) and frames['summary']['department'].dtype == summary['department'].dtype
+    # Plain columns are read-only views on the mapped files rather than copies
+    assert not frames['summary']['avg_kpi_score'].to_numpy().flags.writeable
+
+    # Writing again replaces the snapshot as a whole
+    write_snapshot(directory, {'summary': summary.head(3)}, {'rows': 3})
+    frames, _ = read_snapshot(directory)
+    assert list(frames) == ['summary']
+    assert_mapped_frame_equal(frames['summary'], summary.head(3))
+    assert not os.path.exists(directory + '.tmp') and not os.path.exists(directory + '.old')
+
+def test_snapshot_fingerprint_mismatch(tmp_path):
+    _, summary = load_sample()
+    directory = str(tmp_path / 'snapshot')
+    assert read_snapshot(directory, {'rows': 1}) == (None, 0)
+
+    # Fingerprints hold database values such as dates; they are compared as stored
+    fingerprint = {'max_performance_id': 120, 'loaded_on': pd.Timestamp('2024-05-01')}
+    write_snapshot(directory, {'summary': summary}, fingerprint)
+    assert read_snapshot(directory, dict(fingerprint))[0] is not None
+    assert read_snapshot(directory, dict(fingerprint, max_performance_id=121)) == (None, 0)
+
+def publish_sample(directory, raw, summary, search_index=None, search_unchanged=False):
+    return publish_shared_data(directory, summary, EmployeeTrendIndex(raw), MonthlyRollup(raw, summary).buckets,
+                               SummaryFilterIndex(summary), search_index or EmployeeSearchIndex(summary), search_unchanged)
+
+def test_shared_data_version_swaps(tmp_path):
+    directory = str(tmp_path / 'shared')
+    assert attach_shared_data(directory) is None
+
+    raw, summary = load_sample()
+    assert publish_sample(directory, raw, summary) == 1
+    version, attached_summary, trend_index, buckets, summary_index, search_index = attach_shared_data(directory)
+    assert version == 1
+    assert_mapped_frame_equal(attached_summary, summary)
+    # Strings are not decoded into private arrays; their codes stay on the mapped pages
+    for column in ('full_name', 'email', 'department'):
+        assert is_mapped(attached_summary[column].array.codes)
+    assert_mapped_frame_equal(buckets, MonthlyRollup(raw, summary).buckets)
+    for employee_id in (1, 7, 30):
+        assert_mapped_frame_equal(trend_index.lookup(employee_id), EmployeeTrendIndex(raw).lookup(employee_id))
+
+    # The published filter index maps its row arrays and answers like one built from the summary
+    rebuilt = SummaryFilterIndex(summary)
+    assert summary_index.department_rows.keys() == rebuilt.department_rows.keys()
+    for label, rows in rebuilt.department_rows.items():
+        assert is_mapped(summary_index.department_rows[label])
+        np.testing.assert_array_equal(summary_index.department_rows[label], rows)
+    for departments, positions in ((None, None), (['Sales', 'IT'], None), (None, ['Manager'])):
+        np.testing.assert_array_equal(summary_index.rows(departments, positions), rebuilt.rows(departments, positions))
+        np.testing.assert_allclose(summary_index.overall_averages(departments, positions), rebuilt.overall_averages(departments, positions))
+        pd.testing.assert_frame_equal(summary_index.department_averages(departments, positions),
+                                      rebuilt.department_averages(departments, positions), check_categorical=False)
+
+    # The search index is mapped as published, not rebuilt from the attached summary
+    built = EmployeeSearchIndex(summary)
+    assert is_mapped(search_index.trigrams) and is_mapped(search_index.keys[0])
+    for query in ('arj', 'kumar', 'example.com', 'zz'):
+        assert search_index.search(query) == built.search(query)
+    assert search_index.option(2) == built.option(2) and search_index.covers(summary)
+
+    # Window summaries combine the attached buckets with the categorical attributes
+    window = tuple(to_month(raw['performance_date'].quantile([0.25, 0.75])))
+    attached_rollup = MonthlyRollup.from_buckets(buckets, attached_summary)
+    assert_mapped_frame_equal(attached_rollup.window_summary(*window), MonthlyRollup(raw, summary).window_summary(*window))
+
+    new_raw, new_summary = load_sample(num_employees=40, seed=6)
+    assert publish_sample(directory, new_raw, new_summary) == 2
+    version, attached_summary, trend_index, _, _, _ = attach_shared_data(directory)
+    assert version == 2 and current_version(directory) == 2
+    assert_mapped_frame_equal(attached_summary, new_summary)
+    assert_mapped_frame_equal(trend_index.lookup(40), EmployeeTrendIndex(new_raw).lookup(40))
+
+    # Only the newest KEEP_VERSIONS versions stay on disk
+    for _ in range(KEEP_VERSIONS):
+        publish_sample(directory, raw, summary)
+    assert sorted(name for name in os.listdir(directory) if name.startswith('v')) == [
+        f'v{version:06d}' for version in range(3, 3 + KEEP_VERSIONS)
+    ]
+    assert attach_shared_data(directory)[0] == 2 + KEEP_VERSIONS
+
+@pytest.mark.skipif(os.name == 'nt', reason="mapped files cannot be unlinked on Windows")
+def test_shared_data_mapping_outlives_pruning(tmp_path):
+    directory = str(tmp_path / 'shared')
+    raw, summary = load_sample()
+    publish_sample(directory, raw, summary)
+    attached_summary = attach_shared_data(directory)[1]
+
+    # A worker still serving version 1 keeps reading it after the loader has pruned it
+    for _ in range(KEEP_VERSIONS):
+        publish_sample(directory, raw, summary)
+    assert not os.path.exists(os.path.join(directory, 'v000001'))
+    assert_mapped_frame_equal(attached_summary, summary)
+
+def test_shared_data_links_unchanged_search_index(tmp_path):
+    directory = str(tmp_path / 'shared')
+    raw, summary = load_sample()
+    search_index = EmployeeSearchIndex(summary)
+    publish_sample(directory, raw, summary, search_index)
+    publish_sample(directory, raw, summary, search_index, search_unchanged=True)
+
+    # The second version reuses the first one's files rather than writing them again
+    first, second = (os.path.join(directory, f'v{version:06d}', 'employee_search.0.npy') for version in (1, 2))
+    assert os.path.samefile(first, second)
+    assert attach_shared_data(directory)[5].search('arj') == search_index.search('arj')
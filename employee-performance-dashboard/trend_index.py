@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+TREND_COLUMNS = ['employee_id', 'performance_date', 'performance_id', 'kpi_score', 'attendance_score', 'appraisal_rating']
+# Records of one employee on the same date keep their insertion (performance_id) order
+TREND_ORDER = ['employee_id', 'performance_date', 'performance_id']
+
+def _length(frame):
+    return len(next(iter(frame.values()))) if isinstance(frame, dict) else len(frame)
+
+def insert_rows(ordered, rows, insert_at):
+    """Returns a new frame with rows[i] placed before ordered's row insert_at[i] (insert_at non-decreasing).
+
+    Each column is filled with one scatter of the old and one of the new
+    values, so nothing is re-sorted; used to fold refreshed rows into frames
+    that are kept in a fixed order. ordered and rows may also be dicts of
+    equal-length column arrays, which saves building intermediate frames.
+    Extension columns (strings, categoricals) keep their dtype: they are
+    concatenated once and taken into place instead.
+    """
+    old_length, new_length = _length(ordered), _length(rows)
+    total = old_length + new_length
+    new_positions = insert_at + np.arange(new_length)
+    is_new = np.zeros(total, dtype=bool)
+    is_new[new_positions] = True
+    source = np.empty(total, dtype=np.int64)
+    source[~is_new] = np.arange(old_length)
+    source[new_positions] = old_length + np.arange(new_length)
+    columns = {}
+    for column in ordered:
+        if not isinstance(ordered[column].dtype, np.dtype):
+            old_values = pd.Series(ordered[column], copy=False)
+            new_values = pd.Series(rows[column], dtype=old_values.dtype)
+            columns[column] = pd.concat([old_values, new_values], ignore_index=True).array.take(source)
+            continue
+        old_values, new_values = np.asarray(ordered[column]), np.asarray(rows[column])
+        values = np.empty(total, dtype=np.result_type(old_values.dtype, new_values.dtype))
+        values[~is_new] = old_values
+        values[new_positions] = new_values
+        columns[column] = values
+    # The columns were just allocated, so the frame can own them as they are
+    return pd.DataFrame(columns, copy=False)
+
+class EmployeeTrendIndex:
+    """Date-ordered copy of the performance rows with per-employee slice offsets.
+
+    Rows are sorted by (employee_id, performance_date, performance_id) once, and
+    offsets[employee_id]:offsets[employee_id + 1] delimits one employee's
+    records. Employee ids are dense auto-increment integers, so the offsets
+    live in a plain array and a lookup is two array reads plus a slice,
+    independent of the number of performance rows.
+    """
+
+    def __init__(self, df):
+        if df.empty:
+            self.ordered = df
+            self.offsets = np.zeros(1, dtype=np.int64)
+            return
+
+        self.ordered = df[TREND_COLUMNS].sort_values(TREND_ORDER, ignore_index=True)
+        counts = np.bincount(self.ordered['employee_id'].to_numpy())
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    @classmethod
+    def from_ordered(cls, ordered, offsets):
+        """Wraps rows and offsets produced by another index (e.g. memory-mapped from shared data) without copying."""
+        index = cls.__new__(cls)
+        index.ordered = ordered
+        index.offsets = offsets
+        return index
+
+    def merged(self, df_new):
+        """Returns a new index holding these rows plus df_new, without re-sorting the existing rows.
+
+        Only df_new is sorted; each new row is placed after the existing
+        records of its employee dated on or before it (see insert_rows), which
+        is where the rebuild puts it too, since refreshed rows have higher
+        performance_ids than every loaded one.
+        This index is left untouched, so callbacks can keep reading it while
+        the merged one is built.
+        """
+        if df_new.empty:
+            return self
+        if self.ordered.empty:
+            return EmployeeTrendIndex(df_new)
+
+        new_rows = df_new[TREND_COLUMNS].sort_values(TREND_ORDER, ignore_index=True)
+        new_ids = new_rows['employee_id'].to_numpy()
+        new_dates = new_rows['performance_date'].to_numpy()
+        old_dates = self.ordered['performance_date'].to_numpy()
+
+        # Insertion points into the existing rows; employees without records yet go after the last row
+        insert_at = np.empty(len(new_rows), dtype=np.int64)
+        employee_ids, starts = np.unique(new_ids, return_index=True)
+        stops = np.append(starts[1:], len(new_rows))
+        for employee_id, start, stop in zip(employee_ids, starts, stops):
+            if employee_id < len(self.offsets) - 1:
+                first, last = self.offsets[employee_id], self.offsets[employee_id + 1]
+            else:
+                first = last = self.offsets[-1]
+            insert_at[start:stop] = first + np.searchsorted(old_dates[first:last], new_dates[start:stop], side='right')
+
+        counts = np.diff(self.offsets)
+        new_counts = np.bincount(new_ids)
+        if len(new_counts) > len(counts):
+            counts = np.append(counts, np.zeros(len(new_counts) - len(counts), dtype=counts.dtype))
+        counts[:len(new_counts)] += new_counts
+        return EmployeeTrendIndex.from_ordered(insert_rows(self.ordered, new_rows, insert_at), np.concatenate(([0], np.cumsum(counts))))
+
+    def lookup(self, employee_id):
+        """Returns the employee's records sorted by performance_date, then performance_id (empty if there are none)."""
+        if not 0 <= employee_id < len(self.offsets) - 1:
+            return self.ordered.iloc[0:0]
+        return self.ordered.iloc[self.offsets[employee_id]:self.offsets[employee_id + 1]]